@@ -1,21 +1,64 @@
+import html
 import json
 import os
+import re
+import time
+from datetime import date, datetime, timedelta
 
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from src.get_news import fetch_news_by_query, save_news_to_file
+from src.analytics import (
+    apply_trigger_labels,
+    compute_aggregates,
+    compute_company_counts,
+    compute_watchlist_summary,
+    compute_week_over_week,
+    compute_weekly_trends,
+    prepare_articles_frame,
+)
+from src.dedup import collapse_near_duplicates
+from src.entities import update_company_index
+from src.get_news import (
+    SALES_TRIGGER_QUERIES,
+    fetch_news_by_query,
+    fetch_sales_triggers,
+    load_fetch_state,
+    request_budget,
+    response_cache,
+    save_fetch_state,
+    save_news_to_file,
+)
+from src.matcher import classify_articles, query_hashes
+from src.metrics import metrics
+from src.query import QuerySyntaxError
+from src.scoring import DEFAULT_MIN_RELEVANCE, score_articles
+from src.search import InvertedIndex
+from src.snapshot import load_snapshot, write_snapshot
+from src.store import ArticleStore
+from src.watchlist import WATCHLIST_PATH, WatchlistMatcher, update_watchlist_index
 
 # Page configuration
 st.set_page_config(
     page_title="Patsnap Sales Trigger Dashboard", page_icon="🎯", layout="wide"
 )
+render_started = time.perf_counter()
+
+
+@st.cache_resource
+def get_article_store():
+    """Open the shared article store, importing the legacy JSON file once"""
+    store = ArticleStore()
+    if store.count() == 0 and os.path.exists("data/sales_triggers.json"):
+        store.import_json("data/sales_triggers.json")
+    return store
+
+
+article_store = get_article_store()
 
 
 # Helper function to deduplicate articles
 def deduplicate_articles(articles):
-    """Remove duplicate articles based on URL"""
+    """Remove duplicate articles based on URL, then collapse near-identical copies"""
     seen_urls = set()
     unique = []
     for article in articles:
@@ -23,8 +66,35 @@ def deduplicate_articles(articles):
         if url and url not in seen_urls:
             seen_urls.add(url)
             unique.append(article)
-    return unique
+    return collapse_near_duplicates(unique)
+
+
+# Local search settings for the Articles List tab
+SEARCH_RESULTS_LIMIT = 1000
+SEARCH_HELP = (
+    "Searches titles, descriptions and content of stored articles. "
+    'Use AND, OR, NOT, parentheses, "exact phrases", +required and -excluded words.'
+)
+
+# Regions offered in the sidebar
+REGION_OPTIONS = [
+    "Singapore",
+    "Asia",
+    "United States",
+    "Europe",
+    "China",
+    "India",
+    "Japan",
+]
 
+# Page size options for the Articles List tab
+ARTICLES_PAGE_SIZES = [10, 25, 50, 100]
+
+# Trend periods on the Analytics tab, in days
+TREND_PERIODS = {"90 days": 90, "1 year": 365}
+
+# Articles listed under the selected company on the Analytics tab
+COMPANY_ARTICLE_LIMIT = 20
 
 # Default trigger queries configuration
 DEFAULT_TRIGGERS = {
@@ -38,6 +108,167 @@ DEFAULT_TRIGGERS = {
     "Expansion": '(company OR startup OR firm) AND (expansion OR "opens office" OR "opening" OR "expands into" OR "enters market" OR "new location")',
 }
 
+
+# Parsed DataFrames and chart aggregates are memoized on the store version (or
+# file modification time), so widget interactions don't re-parse the articles.
+# Cached frames are shared between reruns and must not be modified in place.
+def trigger_window_start(days_back):
+    """
+    Start of the displayed window, anchored at the newest stored article
+    (NewsAPI free tier articles are delayed by a day), or None if empty
+    """
+    latest = article_store.latest_published_at()
+    if not latest:
+        return None
+    return (
+        datetime.fromisoformat(latest.rstrip("Z")) - timedelta(days=days_back)
+    ).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+@st.cache_resource(max_entries=16)
+def load_trigger_data(store_version, days_back):
+    """Stored sales trigger articles for the window, as (total, df, aggregates)"""
+    since = trigger_window_start(days_back)
+    if not since:
+        return None
+    # Only the list columns for the selected window, from the memory-mapped
+    # snapshot when it is up to date
+    articles = load_snapshot(since=since, store_version=store_version)
+    if articles is None:
+        articles = article_store.query_articles(since=since)
+    df = prepare_articles_frame(articles, trigger_order=list(DEFAULT_TRIGGERS.keys()))
+    return article_store.count(), df, compute_aggregates(df)
+
+
+@st.cache_resource(max_entries=8)
+def load_reclassified_data(store_version, days_back, trigger_queries):
+    """
+    Stored articles for the window re-tagged offline with (edited) trigger
+    queries, as (total, df, aggregates). No API calls are made.
+    """
+    dataset = load_trigger_data(store_version, days_back)
+    if not dataset:
+        return None
+    total, df, _ = dataset
+    text_columns = ["url", "title", "description", "trigger_type"]
+    since = trigger_window_start(days_back)
+    texts = load_snapshot(
+        columns=text_columns,
+        since=since,
+        store_version=store_version,
+        with_content=True,
+    )
+    if texts is not None:
+        texts = texts.to_dict("records")
+    else:
+        texts = article_store.query_articles(
+            columns=text_columns + ["content"], since=since
+        )
+    # Only triggers whose query text was edited are re-matched; the rest keep
+    # the tag NewsAPI gave them
+    queries = dict(trigger_queries)
+    hashes = query_hashes(queries)
+    recorded = article_store.trigger_query_hashes() or query_hashes(
+        SALES_TRIGGER_QUERIES
+    )
+    kept_triggers = {name for name, h in hashes.items() if recorded.get(name) == h}
+    labels = classify_articles(texts, queries, kept_triggers)
+    shown = len(df)
+    df = apply_trigger_labels(
+        df,
+        {text["url"]: label for text, label in zip(texts, labels)},
+        trigger_order=list(DEFAULT_TRIGGERS.keys()),
+    )
+    aggregates = compute_aggregates(df)
+    aggregates["unmatched"] = shown - len(df)
+    return total, df, aggregates
+
+
+@st.cache_resource(max_entries=4)
+def load_company_tags(store_version, days_back):
+    """Company tags of the stored articles in the window, tagging new ones first"""
+    update_company_index(article_store)
+    return article_store.query_companies(since=trigger_window_start(days_back))
+
+
+def watchlist_modified_at():
+    """Modification time of the watchlist CSV, 0 if there is none"""
+    return os.path.getmtime(WATCHLIST_PATH) if os.path.exists(WATCHLIST_PATH) else 0
+
+
+@st.cache_resource(max_entries=1)
+def get_watchlist_matcher(modified_at):
+    """Watchlist automaton, recompiled when the CSV changes"""
+    return WatchlistMatcher()
+
+
+@st.cache_resource(max_entries=4)
+def load_watchlist_hits(store_version, days_back, modified_at):
+    """Watchlist hits of the stored articles in the window, matching new ones first"""
+    matcher = get_watchlist_matcher(modified_at)
+    update_watchlist_index(article_store, matcher)
+    return matcher, article_store.query_watchlist_hits(
+        since=trigger_window_start(days_back)
+    )
+
+
+@st.cache_resource(max_entries=8)
+def load_trends(store_version, period_days, region):
+    """
+    Weekly trigger counts and week-over-week changes from the daily rollup,
+    as (weekly, week_over_week), or None if nothing is stored
+    """
+    until = article_store.latest_rollup_day()
+    if not until:
+        return None
+    since = (date.fromisoformat(until) - timedelta(days=period_days - 1)).isoformat()
+    rows = article_store.query_rollup(since=since, region=region)
+    trigger_order = list(DEFAULT_TRIGGERS.keys())
+    return (
+        compute_weekly_trends(rows, since, until, trigger_order),
+        compute_week_over_week(rows, until, trigger_order),
+    )
+
+
+@st.cache_resource
+def get_search_index():
+    """Shared full-text index over the article store"""
+    return InvertedIndex()
+
+
+@st.cache_resource(max_entries=1)
+def sync_search_index(store_version):
+    """Index the articles stored since the last sync"""
+    index = get_search_index()
+    index.add_articles(
+        article_store.query_articles(
+            columns=["id", "url", "title", "description", "content"],
+            after_id=index.last_article_id,
+        )
+    )
+    return index
+
+
+@st.cache_resource(max_entries=4)
+def build_search_index(data_file, modified_at):
+    """Full-text index over saved custom search results"""
+    index = InvertedIndex()
+    _, df, _ = load_search_data(data_file, modified_at)
+    index.add_articles(df.to_dict("records"))
+    return index
+
+
+@st.cache_resource(max_entries=4)
+def load_search_data(data_file, modified_at):
+    """Saved custom search results, as (total, df, aggregates)"""
+    with metrics.span("json.load"), open(data_file, "r") as f:
+        news_data = json.load(f)
+    if news_data.get("status") != "ok":
+        return None
+    df = prepare_articles_frame(news_data.get("articles", []))
+    return news_data.get("totalResults", 0), df, compute_aggregates(df)
+
+
 st.title("🎯 Patsnap Sales Trigger Dashboard")
 st.markdown("*Identify sales opportunities through news intelligence*")
 
@@ -66,21 +297,23 @@ with st.sidebar:
         help="publishedAt: newest first | relevancy: most relevant | popularity: most popular sources",
     )
 
-    region = st.selectbox(
-        "Region Filter",
-        [
-            "None (Global)",
-            "Singapore",
-            "Asia",
-            "United States",
-            "Europe",
-            "China",
-            "India",
-            "Japan",
-        ],
-        index=1,  # Default to Singapore
-        help="Filter news by region. 'None' searches globally.",
-    )
+    if mode == "Sales Triggers":
+        regions = st.multiselect(
+            "Regions",
+            REGION_OPTIONS,
+            default=["Singapore"],
+            help="Leave empty to search globally. Several regions are fetched with one "
+            "query per trigger and tagged locally, with targeted queries only for "
+            "regions that come back sparse.",
+        )
+        region = ", ".join(regions) if regions else "None (Global)"
+    else:
+        region = st.selectbox(
+            "Region Filter",
+            ["None (Global)"] + REGION_OPTIONS,
+            index=1,  # Default to Singapore
+            help="Filter news by region. 'None' searches globally.",
+        )
 
     st.markdown("---")
 
@@ -101,6 +334,19 @@ with st.sidebar:
                 if query_text.strip():
                     custom_queries.append((trigger_name, query_text.strip()))
 
+        preview_offline = st.checkbox(
+            "Preview queries on stored articles",
+            value=False,
+            help="Re-apply the queries above to the stored articles locally, without any API calls",
+        )
+
+        incremental = st.checkbox(
+            "Incremental refresh",
+            value=True,
+            help="Only fetch articles newer than the last refresh for each trigger "
+            "(when sorting by publishedAt)",
+        )
+
     else:  # Custom Search mode
         st.markdown("### Custom Search Query")
         query = st.text_area(
@@ -126,59 +372,56 @@ with st.sidebar:
         "🔄 Fetch Latest News", type="primary", use_container_width=True
     )
 
+    if mode == "Sales Triggers":
+        last_ingested = article_store.get_meta("last_ingested_at")
+        if last_ingested:
+            st.caption(
+                f"Last background ingestion: {last_ingested[:16].replace('T', ' ')} UTC"
+            )
+
     st.markdown("---")
     st.markdown("### Quick Stats")
 
 # Load or fetch news data
-data_file = (
-    "data/sales_triggers.json" if mode == "Sales Triggers" else "data/news_data.json"
-)
-news_data = None
+data_file = "data/news_data.json"
 
 if fetch_button:
     with st.spinner("Fetching news articles..."):
-        region_filter = None if region == "None (Global)" else region
 
         try:
             if mode == "Sales Triggers":
-                # Fetch news for each custom query
-                all_articles = []
+                # Fetch all custom queries concurrently
                 progress_bar = st.progress(0)
-
-                for i, (trigger_type, query_text) in enumerate(custom_queries):
-                    # Add region filter if specified
-                    search_query = (
-                        f"({query_text}) AND {region_filter}"
-                        if region_filter
-                        else query_text
-                    )
-
-                    result = fetch_news_by_query(
-                        query=search_query, days_back=days_back, sort_by=sort_by
+                fetch_state = load_fetch_state()
+                result = fetch_sales_triggers(
+                    days_back=days_back,
+                    sort_by=sort_by,
+                    region=regions,
+                    trigger_queries=dict(custom_queries),
+                    progress_callback=lambda done, total: progress_bar.progress(
+                        done / total
+                    ),
+                    incremental=incremental,
+                    fetch_state=fetch_state,
+                )
+                unique_articles = result["articles"]
+                if result["skippedQueries"]:
+                    st.warning(
+                        f"Daily API budget reached: skipped {len(result['skippedQueries'])} "
+                        "queries with the lowest recent yield."
                     )
 
-                    if result and result.get("status") == "ok":
-                        articles = result.get("articles", [])
-                        # Add trigger type to each article
-                        for article in articles:
-                            article["trigger_type"] = trigger_type
-                        all_articles.extend(articles)
-
-                    progress_bar.progress((i + 1) / len(custom_queries))
-
-                # Remove duplicates
-                unique_articles = deduplicate_articles(all_articles)
-
-                # Save results
+                # Upsert results into the article store
                 if unique_articles:
-                    news_data = {
-                        "status": "ok",
-                        "totalResults": len(unique_articles),
-                        "articles": unique_articles,
-                    }
-                    save_news_to_file(news_data, filename="sales_triggers.json")
+                    added = article_store.upsert_articles(unique_articles)
+                    # Only advance the high-water marks once the articles are stored
+                    save_fetch_state(fetch_state)
+                    article_store.record_trigger_queries(
+                        query_hashes(dict(custom_queries))
+                    )
+                    write_snapshot(article_store)
                     st.success(
-                        f"Fetched {len(unique_articles)} unique articles from {len(all_articles)} total!"
+                        f"Fetched {len(unique_articles)} unique articles, {added} new!"
                     )
                 else:
                     st.warning(
@@ -187,6 +430,7 @@ if fetch_button:
 
             else:
                 # Custom search mode
+                region_filter = None if region == "None (Global)" else region
                 search_query = (
                     f"({query}) AND {region_filter}" if region_filter else query
                 )
@@ -195,6 +439,9 @@ if fetch_button:
                 )
 
                 if news_data and news_data.get("status") == "ok":
+                    news_data["articles"] = deduplicate_articles(
+                        news_data.get("articles", [])
+                    )
                     save_news_to_file(news_data)
                     st.success(f"Found {len(news_data.get('articles', []))} articles!")
                 else:
@@ -207,21 +454,50 @@ if fetch_button:
             )
 
 # Try to load existing data
-if news_data is None and os.path.exists(data_file):
+dataset = None
+if mode == "Sales Triggers":
+    if preview_offline:
+        try:
+            dataset = load_reclassified_data(
+                article_store.version(), days_back, tuple(custom_queries)
+            )
+        except QuerySyntaxError as e:
+            st.warning(f"Invalid trigger query: {e}")
+    if dataset is None:
+        dataset = load_trigger_data(article_store.version(), days_back)
+    elif dataset[2]["unmatched"]:
+        st.caption(
+            f"Preview: {dataset[2]['unmatched']} stored articles no longer match "
+            "any trigger query and are hidden"
+        )
+    search_index = sync_search_index(article_store.version())
+elif os.path.exists(data_file):
     try:
-        with open(data_file, "r") as f:
-            news_data = json.load(f)
+        dataset = load_search_data(data_file, os.path.getmtime(data_file))
+        search_index = build_search_index(data_file, os.path.getmtime(data_file))
     except Exception as e:
         st.error(f"Error loading data file: {e}")
 
 # Display the data
-if news_data and news_data.get("status") == "ok":
-    articles = news_data.get("articles", [])
+if dataset:
+    total_results, df, aggregates = dataset
+    # Scoring is cheap enough to redo on every rerun with the current queries
+    if mode == "Sales Triggers":
+        df = score_articles(df, trigger_queries=dict(custom_queries))
+    else:
+        df = score_articles(df, default_query=query)
 
     # Display stats in sidebar
     with st.sidebar:
-        st.metric("Total Results", news_data.get("totalResults", 0))
-        st.metric("Articles Loaded", len(articles))
+        st.metric("Total Results", total_results)
+        st.metric("Articles Loaded", len(df))
+        cache_stats = response_cache.stats()
+        st.caption(
+            f"API cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses"
+        )
+        st.caption(
+            f"API requests left today: {request_budget.remaining()}/{request_budget.daily_limit}"
+        )
 
     # Compact filter summary in an expander
     with st.expander("Active Filters & Queries", expanded=False):
@@ -244,63 +520,194 @@ if news_data and news_data.get("status") == "ok":
             st.code(display_query, language="text")
 
     # Main content
-    if articles:
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(articles)
-        df["publishedAt"] = pd.to_datetime(df["publishedAt"])
-        df["date"] = df["publishedAt"].dt.date
-        df["source_name"] = df["source"].apply(lambda x: x.get("name", "Unknown"))
-
+    if not df.empty:
         # Create tabs for different views
         tab1, tab2, tab3 = st.tabs(["Analytics", "Articles List", "Article Details"])
 
         with tab1:
+            # plotly is only imported once there are charts to draw
+            with metrics.span("startup.import_plotly"):
+                import plotly.express as px
+
             # Show trigger type distribution if in Sales Triggers mode
             if mode == "Sales Triggers" and "trigger_type" in df.columns:
                 st.subheader("Sales Trigger Distribution")
 
-                # Set category order to match DEFAULT_TRIGGERS
+                # Category order matches DEFAULT_TRIGGERS
                 trigger_order = list(DEFAULT_TRIGGERS.keys())
-                df["trigger_type"] = pd.Categorical(
-                    df["trigger_type"], categories=trigger_order, ordered=True
-                )
-
-                trigger_counts = df["trigger_type"].value_counts()
-                fig_triggers = px.pie(
-                    values=trigger_counts.values,
-                    names=trigger_counts.index,
-                    title="Distribution of Sales Triggers",
-                    hole=0.3,
-                    category_orders={"names": trigger_order},
-                )
-                st.plotly_chart(fig_triggers, use_container_width=True)
+                trigger_counts = aggregates["trigger_counts"]
+                with metrics.span("render.chart.triggers"):
+                    fig_triggers = px.pie(
+                        values=trigger_counts.values,
+                        names=trigger_counts.index,
+                        title="Distribution of Sales Triggers",
+                        hole=0.3,
+                        category_orders={"names": trigger_order},
+                    )
+                    st.plotly_chart(fig_triggers, use_container_width=True)
                 st.markdown("---")
 
             col1, col2 = st.columns(2)
 
             with col1:
                 st.subheader("Articles Over Time")
-                articles_per_day = df.groupby("date").size().reset_index(name="count")
-                fig_timeline = px.line(
-                    articles_per_day,
-                    x="date",
-                    y="count",
-                    markers=True,
-                    title="Number of Articles Published per Day",
-                )
-                st.plotly_chart(fig_timeline, use_container_width=True)
+                with metrics.span("render.chart.timeline"):
+                    fig_timeline = px.line(
+                        aggregates["articles_per_day"],
+                        x="date",
+                        y="count",
+                        markers=True,
+                        title="Number of Articles Published per Day",
+                    )
+                    st.plotly_chart(fig_timeline, use_container_width=True)
 
             with col2:
                 st.subheader("Top Sources")
-                source_counts = df["source_name"].value_counts().head(10)
-                fig_sources = px.bar(
-                    x=source_counts.values,
-                    y=source_counts.index,
-                    orientation="h",
-                    title="Top 10 News Sources",
-                    labels={"x": "Number of Articles", "y": "Source"},
+                source_counts = aggregates["source_counts"]
+                with metrics.span("render.chart.sources"):
+                    fig_sources = px.bar(
+                        x=source_counts.values,
+                        y=source_counts.index,
+                        orientation="h",
+                        title="Top 10 News Sources",
+                        labels={"x": "Number of Articles", "y": "Source"},
+                    )
+                    st.plotly_chart(fig_sources, use_container_width=True)
+
+            if mode == "Sales Triggers":
+                st.markdown("---")
+                st.subheader("Top Companies")
+                company_tags = load_company_tags(article_store.version(), days_back)
+                company_counts = compute_company_counts(df, company_tags)
+                if company_counts.empty:
+                    st.info("No company names found in these articles")
+                else:
+                    with metrics.span("render.chart.companies"):
+                        fig_companies = px.bar(
+                            x=company_counts.values,
+                            y=company_counts.index,
+                            orientation="h",
+                            title=f"Top {len(company_counts)} Companies Mentioned",
+                            labels={"x": "Number of Articles", "y": "Company"},
+                        )
+                        fig_companies.update_layout(
+                            yaxis={"categoryorder": "total ascending"}
+                        )
+                        st.plotly_chart(fig_companies, use_container_width=True)
+
+                    selected_company = st.selectbox(
+                        "Articles about", company_counts.index
+                    )
+                    company_urls = {
+                        tag["url"]
+                        for tag in company_tags
+                        if tag["company"] == selected_company
+                    }
+                    company_df = df[df["url"].isin(company_urls)]
+                    latest = company_df.nlargest(COMPANY_ARTICLE_LIMIT, "publishedAt")
+                    for row in latest.to_dict("records"):
+                        st.markdown(
+                            f"- [{row['title']}]({row['url']}) "
+                            f"*({row['source_name']}, {row['publishedAt']:%Y-%m-%d})*"
+                        )
+                    if len(company_df) > COMPANY_ARTICLE_LIMIT:
+                        st.caption(
+                            f"Showing the latest {COMPANY_ARTICLE_LIMIT} of "
+                            f"{len(company_df)} articles"
+                        )
+
+                st.markdown("---")
+                st.subheader("Watchlist Accounts")
+                watchlist, watchlist_hits = load_watchlist_hits(
+                    article_store.version(), days_back, watchlist_modified_at()
                 )
-                st.plotly_chart(fig_sources, use_container_width=True)
+                watchlist_summary = compute_watchlist_summary(
+                    df, watchlist_hits, recent_since=trigger_window_start(1)
+                )
+                if not watchlist.accounts:
+                    st.info(
+                        "No watchlist yet: add account names and aliases to "
+                        "config/watchlist.csv"
+                    )
+                elif watchlist_summary.empty:
+                    st.info(
+                        f"None of the {len(watchlist.accounts)} watchlist accounts "
+                        "are in these articles"
+                    )
+                else:
+                    in_the_news = watchlist_summary[watchlist_summary["new"] > 0]
+                    if not in_the_news.empty:
+                        st.warning(
+                            "🔔 Watchlist accounts in the news in the last day: "
+                            + ", ".join(in_the_news["account"])
+                        )
+                    st.dataframe(
+                        watchlist_summary.assign(
+                            owner=watchlist_summary["account"].map(
+                                lambda a: watchlist.accounts[a]["owner"]
+                            )
+                        ),
+                        hide_index=True,
+                        use_container_width=True,
+                        column_config={
+                            "account": "Account",
+                            "articles": "Articles",
+                            "new": "Last day",
+                            "latest": st.column_config.DatetimeColumn(
+                                "Latest", format="YYYY-MM-DD HH:mm"
+                            ),
+                            "owner": "Owner",
+                        },
+                    )
+
+                # Long-range trends come from the daily rollup, not the articles
+                st.markdown("---")
+                st.subheader("Trigger Trends")
+                trend_col1, trend_col2 = st.columns(2)
+                with trend_col1:
+                    trend_period = st.radio(
+                        "Trend period", list(TREND_PERIODS), horizontal=True
+                    )
+                with trend_col2:
+                    trend_region = st.selectbox(
+                        "Trend region", ["All regions"] + REGION_OPTIONS
+                    )
+                trends = load_trends(
+                    article_store.version(),
+                    TREND_PERIODS[trend_period],
+                    None if trend_region == "All regions" else trend_region,
+                )
+                if trends:
+                    weekly, week_over_week = trends
+                    if not week_over_week.empty:
+                        metric_cols = st.columns(len(week_over_week))
+                        for col, (trigger, row) in zip(
+                            metric_cols, week_over_week.iterrows()
+                        ):
+                            col.metric(
+                                f"{trigger} 🔺" if row["spike"] else trigger,
+                                int(row["this_week"]),
+                                delta=int(row["this_week"] - row["last_week"]),
+                                help="Articles in the last 7 days vs the 7 days before",
+                            )
+                        spikes = week_over_week.index[week_over_week["spike"]]
+                        if len(spikes):
+                            st.warning(f"Week-over-week spike: {', '.join(spikes)}")
+                    with metrics.span("render.chart.trends"):
+                        fig_trends = px.line(
+                            weekly,
+                            x="week",
+                            y="articles",
+                            color="trigger_type",
+                            markers=True,
+                            title=f"Articles per Week (last {trend_period})",
+                            labels={
+                                "week": "Week",
+                                "articles": "Number of Articles",
+                                "trigger_type": "Trigger",
+                            },
+                        )
+                        st.plotly_chart(fig_trends, use_container_width=True)
 
             # Word cloud-style visualization of authors (commented out for future use)
             # st.subheader("Most Active Authors")
@@ -330,30 +737,75 @@ if news_data and news_data.get("status") == "ok":
                 with col1:
                     selected_triggers = st.multiselect(
                         "Filter by Trigger Type",
-                        options=df["trigger_type"].unique(),
+                        options=aggregates["trigger_options"],
                         default=None,
                     )
                 with col2:
                     selected_sources = st.multiselect(
                         "Filter by Source",
-                        options=df["source_name"].unique(),
+                        options=aggregates["source_options"],
                         default=None,
                     )
                 with col3:
-                    search_term = st.text_input("Search in titles", "")
+                    search_term = st.text_input("Search articles", "", help=SEARCH_HELP)
+                search_history = st.checkbox(
+                    "Search all stored history",
+                    value=False,
+                    help="Search every stored article instead of the selected time period",
+                )
+                region_options = sorted(
+                    set(",".join(df["regions"].dropna()).split(",")) - {""}
+                )
+                selected_regions = st.multiselect(
+                    "Filter by Region", options=region_options, default=None
+                )
+                _, watchlist_hits = load_watchlist_hits(
+                    article_store.version(), days_back, watchlist_modified_at()
+                )
+                watchlist_accounts = {}
+                for hit in watchlist_hits:
+                    watchlist_accounts.setdefault(hit["url"], []).append(hit["account"])
+                selected_accounts = st.multiselect(
+                    "Filter by Watchlist Account",
+                    options=sorted({hit["account"] for hit in watchlist_hits}),
+                    default=None,
+                )
             else:
                 col1, col2 = st.columns(2)
                 with col1:
                     selected_sources = st.multiselect(
                         "Filter by Source",
-                        options=df["source_name"].unique(),
+                        options=aggregates["source_options"],
                         default=None,
                     )
                 with col2:
-                    search_term = st.text_input("Search in titles", "")
+                    search_term = st.text_input("Search articles", "", help=SEARCH_HELP)
+                search_history = False
+                selected_regions = []
+                selected_accounts = []
+                watchlist_accounts = {}
+
+            # Run the local full-text search first, it decides the base rows
+            search_scores = None
+            filtered_df = df
+            if search_term:
+                try:
+                    # The limit applies after the window and filters, so window
+                    # matches ranked low across the whole store aren't lost;
+                    # history search covers the whole store and is limited here
+                    ranked = search_index.search(search_term)
+                    if search_history:
+                        ranked = ranked[:SEARCH_RESULTS_LIMIT]
+                    search_scores = dict(ranked)
+                except QuerySyntaxError as e:
+                    st.warning(f"Invalid search query: {e}")
+            if search_scores is not None and search_history:
+                filtered_df = prepare_articles_frame(
+                    article_store.query_articles(urls=list(search_scores)),
+                    trigger_order=list(DEFAULT_TRIGGERS.keys()),
+                )
 
             # Apply filters
-            filtered_df = df.copy()
             if (
                 mode == "Sales Triggers"
                 and "trigger_type" in df.columns
@@ -366,15 +818,95 @@ if news_data and news_data.get("status") == "ok":
                 filtered_df = filtered_df[
                     filtered_df["source_name"].isin(selected_sources)
                 ]
-            if search_term:
+            if selected_regions and "regions" in filtered_df.columns:
+                # regions holds every region an article was tagged with, comma-joined
+                region_pattern = "(?:^|,)(?:{})(?:,|$)".format(
+                    "|".join(re.escape(r) for r in selected_regions)
+                )
+                filtered_df = filtered_df[
+                    filtered_df["regions"].fillna("").str.contains(region_pattern)
+                ]
+            if selected_accounts:
                 filtered_df = filtered_df[
-                    filtered_df["title"].str.contains(search_term, case=False, na=False)
+                    filtered_df["url"].map(
+                        lambda url: any(
+                            a in selected_accounts
+                            for a in watchlist_accounts.get(url, ())
+                        )
+                    )
+                ]
+            if search_scores is not None and search_history:
+                # History rows come straight from the store and need a score
+                filtered_df = score_articles(
+                    filtered_df, trigger_queries=dict(custom_queries)
+                )
+
+            sort_col, relevance_col = st.columns(2)
+            with sort_col:
+                sort_articles_by = st.selectbox(
+                    "Sort articles by",
+                    ["Relevance", "Newest"],
+                    help="Search results are always ranked by search score",
+                )
+            with relevance_col:
+                min_relevance = st.slider(
+                    "Minimum relevance",
+                    min_value=0,
+                    max_value=100,
+                    value=DEFAULT_MIN_RELEVANCE,
+                    help="Relevance blends source reputation, keyword density, "
+                    "recency and trigger-specific negative terms",
+                )
+            below_threshold = int((filtered_df["relevance"] < min_relevance).sum())
+            filtered_df = filtered_df[filtered_df["relevance"] >= min_relevance]
+
+            if search_scores is not None and not filtered_df.empty:
+                # Keep matches only, best BM25 score first
+                scores = filtered_df["url"].map(search_scores)
+                filtered_df = filtered_df[scores.notna()]
+                filtered_df = filtered_df.iloc[
+                    (-scores.dropna()).argsort(kind="stable").to_numpy()
+                ]
+                if len(filtered_df) > SEARCH_RESULTS_LIMIT:
+                    st.caption(
+                        f"Showing the best {SEARCH_RESULTS_LIMIT} of "
+                        f"{len(filtered_df)} matches"
+                    )
+                    filtered_df = filtered_df.head(SEARCH_RESULTS_LIMIT)
+            elif sort_articles_by == "Relevance" and not filtered_df.empty:
+                filtered_df = filtered_df.iloc[
+                    (-filtered_df["relevance"]).argsort(kind="stable").to_numpy()
                 ]
 
+            # Paginate so only the visible slice of articles is rendered
+            page_col, size_col = st.columns([3, 1])
+            with size_col:
+                page_size = st.selectbox(
+                    "Articles per page", ARTICLES_PAGE_SIZES, index=1
+                )
+            page_count = max(1, -(-len(filtered_df) // page_size))
+            with page_col:
+                page = st.number_input(
+                    f"Page (of {page_count})",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    step=1,
+                )
+            start = (page - 1) * page_size
+            page_df = filtered_df.iloc[start : start + page_size]
+
             # Display articles
-            st.write(f"Showing {len(filtered_df)} articles")
+            st.write(
+                f"Showing {start + 1 if len(page_df) else 0}-{start + len(page_df)} "
+                f"of {len(filtered_df)} articles"
+            )
+            if below_threshold:
+                st.caption(
+                    f"{below_threshold} articles below the minimum relevance are hidden"
+                )
 
-            for idx, article in filtered_df.iterrows():
+            for article in page_df.to_dict("records"):
                 with st.expander(f"{article['title']}", expanded=False):
                     col1, col2 = st.columns([3, 1])
 
@@ -388,6 +920,12 @@ if news_data and news_data.get("status") == "ok":
                         # Show trigger type if in Sales Triggers mode
                         if article.get("trigger_type"):
                             st.markdown(f"**Trigger Type:** {article['trigger_type']}")
+                        if watchlist_accounts.get(article["url"]):
+                            st.markdown(
+                                "**Watchlist:** "
+                                + ", ".join(watchlist_accounts[article["url"]])
+                            )
+                        st.markdown(f"**Relevance:** {article['relevance']:.0f}/100")
 
                         if article.get("description"):
                             st.markdown(f"**Description:** {article['description']}")
@@ -396,12 +934,17 @@ if news_data and news_data.get("status") == "ok":
 
                     with col2:
                         if article.get("urlToImage"):
-                            st.image(article["urlToImage"], use_container_width=True)
+                            # Let the browser defer loading until it scrolls into view
+                            st.markdown(
+                                f'<img src="{html.escape(article["urlToImage"])}" '
+                                'loading="lazy" style="width:100%">',
+                                unsafe_allow_html=True,
+                            )
 
         with tab3:
             st.subheader("Select an Article to View Details")
 
-            article_titles = [f"{i+1}. {a['title']}" for i, a in enumerate(articles)]
+            article_titles = [f"{i+1}. {title}" for i, title in enumerate(df["title"])]
             selected_article_idx = st.selectbox(
                 "Choose an article",
                 range(len(article_titles)),
@@ -409,7 +952,9 @@ if news_data and news_data.get("status") == "ok":
             )
 
             if selected_article_idx is not None:
-                article = articles[selected_article_idx]
+                article = df.iloc[selected_article_idx].to_dict()
+                if "content" not in article:
+                    article["content"] = article_store.get_content(article["url"])
 
                 # Display article image if available
                 if article.get("urlToImage"):
@@ -417,7 +962,7 @@ if news_data and news_data.get("status") == "ok":
 
                 st.markdown(f"## {article['title']}")
                 st.markdown(
-                    f"*By {article.get('author', 'Unknown')} | {article['source']['name']} | {article['publishedAt']}*"
+                    f"*By {article.get('author', 'Unknown')} | {article['source_name']} | {article['publishedAt'].strftime('%Y-%m-%d %H:%M')}*"
                 )
 
                 # Show trigger type if available
@@ -434,6 +979,14 @@ if news_data and news_data.get("status") == "ok":
                     st.markdown(f"### Content")
                     st.markdown(article["content"])
 
+                duplicate_urls = article.get("duplicate_urls")
+                if not isinstance(duplicate_urls, list):
+                    duplicate_urls = article_store.get_duplicate_urls(article["url"])
+                if duplicate_urls:
+                    with st.expander(f"{len(duplicate_urls)} near-identical copies"):
+                        for duplicate_url in duplicate_urls:
+                            st.markdown(f"- {duplicate_url}")
+
                 st.markdown(f"### [Read Full Article →]({article['url']})")
     else:
         st.info("No articles found. Try adjusting your search parameters.")
@@ -468,3 +1021,45 @@ else:
     **Get started by selecting a mode and clicking 'Fetch Latest News' in the sidebar!**
     """
     )
+
+# Timings and counters collected by this server process
+metrics.record("render.page", time.perf_counter() - render_started)
+with st.sidebar:
+    st.markdown("---")
+    with st.expander("🩺 Diagnostics", expanded=False):
+        snapshot = metrics.snapshot()
+        if snapshot["spans"]:
+            st.markdown("**Timings (ms)**")
+            st.dataframe(
+                [
+                    {
+                        "span": name,
+                        "calls": stats["count"],
+                        "last": round(stats["last"] * 1000, 1),
+                        "mean": round(stats["mean"] * 1000, 1),
+                        "max": round(stats["max"] * 1000, 1),
+                        "total": round(stats["total"] * 1000, 1),
+                    }
+                    for name, stats in sorted(snapshot["spans"].items())
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+        if snapshot["counters"]:
+            st.markdown("**Counters**")
+            st.dataframe(
+                [
+                    {"counter": name, "value": value}
+                    for name, value in sorted(snapshot["counters"].items())
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+        st.download_button(
+            "Download Prometheus metrics",
+            metrics.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+        )
+        if st.button("Reset metrics"):
+            metrics.reset()
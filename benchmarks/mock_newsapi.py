@@ -0,0 +1,171 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import generate_page
+
+# Results the mock reports for every query, like NewsAPI's totalResults
+DEFAULT_TOTAL_RESULTS = 250
+
+
+class MockNewsApiConfig:
+    """
+    Behaviour of the mock NewsAPI server
+
+    Args:
+        latency_ms: Mean response delay
+        jitter_ms: Uniform +/- jitter on the delay
+        failure_rate: Share of requests answered with a 500 error
+        rate_limit_rate: Share of requests answered with a 429 rateLimited
+        total_results: totalResults reported for every query
+        seed: Seed for the generated articles and the error draws
+    """
+
+    def __init__(
+        self,
+        latency_ms=200,
+        jitter_ms=50,
+        failure_rate=0.0,
+        rate_limit_rate=0.0,
+        total_results=DEFAULT_TOTAL_RESULTS,
+        seed=0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.total_results = total_results
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+
+
+class MockNewsApiHandler(BaseHTTPRequestHandler):
+    """Serves /v2/everything with synthetic articles over keep-alive HTTP/1.1"""
+
+    protocol_version = "HTTP/1.1"
+    config = MockNewsApiConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        config = self.config
+        with config.lock:
+            config.requests += 1
+            delay = config.latency_ms + config.rng.uniform(
+                -config.jitter_ms, config.jitter_ms
+            )
+            draw = config.rng.random()
+        time.sleep(max(0.0, delay) / 1000)
+
+        url = urlparse(self.path)
+        if url.path != "/v2/everything":
+            self._reply(404, {"status": "error", "code": "notFound"})
+            return
+        if draw < config.rate_limit_rate:
+            with config.lock:
+                config.rate_limited += 1
+            self._reply(
+                429,
+                {
+                    "status": "error",
+                    "code": "rateLimited",
+                    "message": "Mock rate limit",
+                },
+            )
+            return
+        if draw < config.rate_limit_rate + config.failure_rate:
+            with config.lock:
+                config.errors += 1
+            self._reply(
+                500,
+                {
+                    "status": "error",
+                    "code": "unexpectedError",
+                    "message": "Mock failure",
+                },
+            )
+            return
+
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        page = int(params.get("page", 1))
+        page_size = int(params.get("pageSize", 100))
+        articles = generate_page(
+            params.get("q", ""), page, page_size, config.total_results, config.seed
+        )
+        self._reply(
+            200,
+            {
+                "status": "ok",
+                "totalResults": config.total_results,
+                "articles": articles,
+            },
+        )
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """
+    Run the mock server on a background thread
+
+    Args:
+        config: Optional MockNewsApiConfig
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+
+    Returns:
+        tuple: (server, base URL); call server.shutdown() to stop it
+    """
+    handler = type(
+        "ConfiguredHandler",
+        (MockNewsApiHandler,),
+        {"config": config or MockNewsApiConfig()},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for NewsAPI")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--total-results", type=int, default=DEFAULT_TOTAL_RESULTS)
+    args = parser.parse_args()
+
+    config = MockNewsApiConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        total_results=args.total_results,
+    )
+    server, base_url = start_mock_server(config, port=args.port)
+    print(f"Mock NewsAPI listening on {base_url}/v2/everything")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
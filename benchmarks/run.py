@@ -0,0 +1,330 @@
+import argparse
+import glob
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+
+import newsapi.newsapi_client
+from newsapi import NewsApiClient
+
+import src.get_news as get_news
+from benchmarks.mock_newsapi import MockNewsApiConfig, start_mock_server
+from benchmarks.synthetic import generate_articles
+from src.analytics import compute_aggregates, prepare_articles_frame
+from src.budget import BudgetedNewsApiClient, RequestBudget
+from src.cache import CachedNewsApiClient, ResponseCache
+from src.dedup import collapse_near_duplicates
+from src.scoring import score_articles
+from src.search import InvertedIndex
+from src.snapshot import load_snapshot, write_snapshot
+from src.store import ArticleStore
+from src.transport import build_session
+
+# Where benchmark runs are saved, one JSON file per run
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Article counts benchmarked by default (100000 also works, but takes minutes)
+DEFAULT_SIZES = [1000, 10000]
+
+# Queries timed against the inverted index
+SEARCH_QUERIES = [
+    "patent",
+    '"drug discovery"',
+    "launches AND (Singapore OR Asia) NOT trademark",
+]
+
+# Cold-start imports timed in a fresh interpreter each time
+STARTUP_IMPORTS = {
+    "fetch": "import src.get_news",
+    "ingest": "import src.ingest",
+    "dashboard": "import streamlit, src.analytics, src.get_news, src.search, src.store",
+}
+
+# Change in median time (as a share) reported as a regression or improvement
+COMPARE_TOLERANCE = 0.1
+
+
+def time_call(func, repeat):
+    """
+    Time a zero-argument callable
+
+    Returns:
+        dict: Median and minimum wall time in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"median": statistics.median(timings), "min": min(timings)}
+
+
+@contextmanager
+def mock_fetch_env(base_url, workdir):
+    """
+    Point src.get_news at the mock server with a fresh cache and budget
+    The client uses the same pooled session as get_news.get_client. Everything
+    the fetch writes (cache, budget, fetch state) goes to workdir.
+    """
+    saved = (
+        newsapi.newsapi_client.const.EVERYTHING_URL,
+        get_news.newsapi,
+        get_news.request_budget,
+        get_news.response_cache,
+        get_news.FETCH_STATE_FILE,
+    )
+    cache = ResponseCache(os.path.join(workdir, "cache.db"))
+    budget = RequestBudget(os.path.join(workdir, "budget.json"), daily_limit=10**9)
+    newsapi.newsapi_client.const.EVERYTHING_URL = f"{base_url}/v2/everything"
+    get_news.response_cache = cache
+    get_news.request_budget = budget
+    client = NewsApiClient(
+        api_key="benchmark",
+        session=build_session(pool_size=get_news.MAX_CONCURRENT_REQUESTS),
+    )
+    get_news.newsapi = CachedNewsApiClient(BudgetedNewsApiClient(client, budget), cache)
+    get_news.FETCH_STATE_FILE = os.path.join(workdir, "fetch_state.json")
+    try:
+        yield
+    finally:
+        (
+            newsapi.newsapi_client.const.EVERYTHING_URL,
+            get_news.newsapi,
+            get_news.request_budget,
+            get_news.response_cache,
+            get_news.FETCH_STATE_FILE,
+        ) = saved
+
+
+def bench_startup(repeat):
+    """Cold-start import time of the fetch module, ingestion and dashboard"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for name, statement in STARTUP_IMPORTS.items():
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"{statement}; print(time.perf_counter() - start)"
+        )
+        timings = []
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=root,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            timings.append(float(output.split()[-1]))
+        results[f"startup.{name}"] = {
+            "median": statistics.median(timings),
+            "min": min(timings),
+        }
+    return results
+
+
+def bench_fetch(base_url, repeat, regions):
+    """Cold (empty cache) and warm fetch_sales_triggers timings"""
+    results = {}
+    for multi_region in (True, False):
+        label = "multi_region" if multi_region else "per_region"
+        cold, warm = [], []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as workdir:
+                # The fetch prints a line per query; keep the report readable
+                with mock_fetch_env(base_url, workdir), redirect_stdout(io.StringIO()):
+                    for timings in (cold, warm):
+                        start = time.perf_counter()
+                        get_news.fetch_sales_triggers(
+                            region=regions, multi_region=multi_region
+                        )
+                        timings.append(time.perf_counter() - start)
+        for name, timings in (("cold", cold), ("warm", warm)):
+            results[f"fetch_sales_triggers.{label}.{name}"] = {
+                "median": statistics.median(timings),
+                "min": min(timings),
+            }
+    return results
+
+
+def bench_articles(size, repeat, seed):
+    """Timings of the local processing steps on size synthetic articles"""
+    articles = generate_articles(size, seed=seed)
+    df = prepare_articles_frame(articles)
+    scored = score_articles(df)
+    triggers = ["Patent & IP", "Expansion"]
+    results = {}
+
+    def run(name, func):
+        results[f"{name}[{size}]"] = time_call(func, repeat)
+
+    run("collapse_near_duplicates", lambda: collapse_near_duplicates(articles))
+    run("prepare_articles_frame", lambda: prepare_articles_frame(articles))
+    run("score_articles", lambda: score_articles(df))
+    run("filter.trigger_isin", lambda: scored[scored["trigger_type"].isin(triggers)])
+    run("filter.min_relevance", lambda: scored[scored["relevance"] >= 40])
+    run(
+        "filter.sort_relevance",
+        lambda: scored.sort_values("relevance", ascending=False),
+    )
+
+    index = InvertedIndex()
+    run("search.build_index", lambda: InvertedIndex().add_articles(articles))
+    index.add_articles(articles)
+    for query in SEARCH_QUERIES:
+        run(f"search.query {query}", lambda: index.search(query, limit=50))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = ArticleStore(os.path.join(workdir, "articles.db"))
+        start = time.perf_counter()
+        store.upsert_articles(articles)
+        elapsed = time.perf_counter() - start
+        results[f"store.upsert_articles[{size}]"] = {"median": elapsed, "min": elapsed}
+
+        def dashboard_load(load):
+            frame = prepare_articles_frame(load())
+            compute_aggregates(frame)
+            score_articles(frame)
+
+        run("dashboard_load", lambda: dashboard_load(store.query_articles))
+
+        snapshot_path = os.path.join(workdir, "articles.arrow")
+        content_path = os.path.join(workdir, "articles_content.arrow")
+        run(
+            "snapshot.write",
+            lambda: write_snapshot(store, snapshot_path, content_path),
+        )
+        run(
+            "dashboard_load.snapshot",
+            lambda: dashboard_load(
+                lambda: load_snapshot(path=snapshot_path, content_path=content_path)
+            ),
+        )
+    return results
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or "unknown" outside a git repo"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(run_info, results_dir=RESULTS_DIR):
+    """Write a benchmark run to results_dir and return the file path"""
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(results_dir, f"{stamp}_{run_info['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(run_info, f, indent=2)
+    return path
+
+
+def latest_results(exclude=None, results_dir=RESULTS_DIR):
+    """Most recent saved run other than exclude, or None"""
+    paths = sorted(glob.glob(os.path.join(results_dir, "*.json")))
+    paths = [p for p in paths if p != exclude]
+    if not paths:
+        return None
+    with open(paths[-1], "r") as f:
+        return json.load(f)
+
+
+def compare(previous, current, tolerance=COMPARE_TOLERANCE):
+    """Print the change in median time of every benchmark in both runs"""
+    print(f"\nCompared with {previous['commit']} ({previous['timestamp']}):")
+    for name, timing in current["results"].items():
+        before = previous["results"].get(name)
+        if not before or not before["median"]:
+            continue
+        change = timing["median"] / before["median"] - 1
+        flag = ""
+        if change > tolerance:
+            flag = "  slower"
+        elif change < -tolerance:
+            flag = "  faster"
+        print(f"  {name:<55} {change:+7.1%}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the news pipeline")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated synthetic article counts",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    parser.add_argument("--jitter-ms", type=float, default=30)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--regions",
+        default="Singapore,Asia,United States",
+        help="Comma-separated regions for the fetch benchmark",
+    )
+    parser.add_argument("--skip-fetch", action="store_true")
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare with the most recent saved run",
+    )
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    results = bench_startup(args.repeat)
+    if not args.skip_fetch:
+        config = MockNewsApiConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            failure_rate=args.failure_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            seed=args.seed,
+        )
+        server, base_url = start_mock_server(config)
+        try:
+            results.update(bench_fetch(base_url, args.repeat, args.regions.split(",")))
+        finally:
+            server.shutdown()
+    for size in sizes:
+        results.update(bench_articles(size, args.repeat, args.seed))
+
+    for name, timing in results.items():
+        print(
+            f"{name:<55} median {timing['median'] * 1000:10.1f} ms"
+            f"   min {timing['min'] * 1000:10.1f} ms"
+        )
+
+    run_info = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": vars(args),
+        "results": results,
+    }
+    path = save_results(run_info)
+    print(f"\nResults saved to {path}")
+    if args.compare:
+        previous = latest_results(exclude=path)
+        if previous:
+            compare(previous, run_info)
+        else:
+            print("No earlier results to compare with")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import random
+import zlib
+from datetime import datetime, timedelta, timezone
+
+# Building blocks for synthetic, NewsAPI-shaped articles
+NAME_PARTS = [
+    "Acu",
+    "Bio",
+    "Cor",
+    "Data",
+    "Evo",
+    "Flux",
+    "Geo",
+    "Hyper",
+    "Inno",
+    "Kine",
+    "Lumi",
+    "Meri",
+    "Nova",
+    "Opti",
+    "Pyro",
+    "Quanta",
+    "Robo",
+    "Sino",
+    "Tera",
+    "Vita",
+    "Xeno",
+    "Zen",
+]
+NAME_SUFFIXES = [
+    "tech",
+    "gen",
+    "labs",
+    "works",
+    "soft",
+    "med",
+    "link",
+    "ware",
+    "logic",
+    "sys",
+]
+COMPANY_FORMS = ["", " Ltd", " Inc", " Group", " Holdings", " Pte Ltd"]
+TRIGGER_TEMPLATES = {
+    "Patent & IP": [
+        "{company} secures patent for {thing}",
+        "{company} granted {region} patent covering {thing}",
+        "{company} files trademark for {thing}",
+    ],
+    "Product Launch": [
+        "{company} launches {thing} in {region}",
+        "{company} unveils new {thing}",
+        "{company} announces {thing} for enterprise customers",
+    ],
+    "Expansion": [
+        "{company} opens office in {region}",
+        "{company} expands into {region} with {thing}",
+        "{company} enters {region} market",
+    ],
+}
+THINGS = [
+    "AI-powered drug discovery platform",
+    "battery recycling process",
+    "quantum sensing chip",
+    "payments API",
+    "robotic warehouse system",
+    "low-carbon cement",
+    "satellite imaging service",
+    "genomics assay",
+    "edge computing module",
+    "digital twin software",
+]
+REGIONS = ["Singapore", "Asia", "China", "India", "Japan", "Europe", "United States"]
+SOURCES = [
+    "Reuters",
+    "Bloomberg",
+    "The Straits Times",
+    "The Business Times",
+    "GlobeNewswire",
+    "PR Newswire",
+    "Business Wire",
+    "TechCrunch",
+    "The Times of India",
+    "BusinessLine",
+    "Cointelegraph",
+    "MacRumors",
+    "Plos.org",
+    "Local Blog",
+]
+FILLER = (
+    "The company said the move builds on strong demand from customers "
+    "across the region and follows a year of rapid growth. Analysts "
+    "expect further announcements in the coming quarters."
+)
+
+# Per-article detail sentences, so unrelated articles aren't near-duplicates
+DETAIL_TEMPLATES = [
+    "Revenue rose {pct}% to ${amount} million in the {quarter} quarter.",
+    "It employs {people} people and plans {hires} hires by {year}.",
+    "Chief executive {person} said {count} customers signed up in week {week}.",
+    "The {amount} million deal closes on {day} {month} pending approval.",
+]
+
+
+def company_name(rng):
+    """A random, plausible-looking company name"""
+    return (
+        rng.choice(NAME_PARTS) + rng.choice(NAME_SUFFIXES) + rng.choice(COMPANY_FORMS)
+    )
+
+
+def details(rng):
+    """Two detail sentences filled with random figures"""
+    fields = {
+        "pct": rng.randint(2, 95),
+        "amount": rng.randint(5, 900),
+        "quarter": rng.choice(["first", "second", "third", "fourth"]),
+        "people": rng.randint(20, 20000),
+        "hires": rng.randint(5, 500),
+        "year": rng.randint(2025, 2030),
+        "person": company_name(rng).split()[0].title() + " " + rng.choice(NAME_PARTS),
+        "count": rng.randint(3, 3000),
+        "week": rng.randint(1, 52),
+        "day": rng.randint(1, 28),
+        "month": rng.choice(["March", "June", "September", "December"]),
+    }
+    return " ".join(t.format(**fields) for t in rng.sample(DETAIL_TEMPLATES, 2))
+
+
+def generate_article(rng, index, published_at, trigger=None):
+    """One synthetic NewsAPI article dict tagged with a trigger_type"""
+    trigger = trigger or rng.choice(list(TRIGGER_TEMPLATES))
+    region = rng.choice(REGIONS)
+    title = rng.choice(TRIGGER_TEMPLATES[trigger]).format(
+        company=company_name(rng), thing=rng.choice(THINGS), region=region
+    )
+    source = rng.choice(SOURCES)
+    return {
+        "source": {"id": None, "name": source},
+        "author": f"Reporter {rng.randint(1, 500)}",
+        "title": title,
+        "description": f"{title}. {details(rng)}",
+        "url": f"https://news.example.com/{index}",
+        "urlToImage": f"https://news.example.com/{index}.jpg",
+        "publishedAt": published_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "content": f"{title}. {FILLER} {FILLER} [+{rng.randint(500, 5000)} chars]",
+        "trigger_type": trigger,
+    }
+
+
+def generate_articles(count, seed=0, duplicate_rate=0.1, days=30, end=None):
+    """
+    Generate synthetic articles, including syndicated near-duplicates
+
+    Args:
+        count: Number of articles
+        seed: Random seed, the same seed gives the same articles
+        duplicate_rate: Share of articles that are reposts of an earlier one
+            (same text, different URL and source)
+        days: Publication dates are spread over this many days
+        end: Newest publication time (defaults to now)
+
+    Returns:
+        list: Article dicts, newest first
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now(timezone.utc)
+    step = timedelta(days=days) / max(count, 1)
+    articles = []
+    for i in range(count):
+        published_at = end - step * i
+        if articles and rng.random() < duplicate_rate:
+            original = rng.choice(articles[-200:])
+            article = dict(original)
+            article["source"] = {"id": None, "name": rng.choice(SOURCES)}
+            article["url"] = f"https://news.example.com/{i}"
+            article["publishedAt"] = published_at.strftime("%Y-%m-%dT%H:%M:%SZ")
+        else:
+            article = generate_article(rng, i, published_at)
+        articles.append(article)
+    return articles
+
+
+def generate_page(query, page, page_size, total_results, seed=0):
+    """
+    Deterministic page of articles for a query, as a mock /everything
+    response would return it
+
+    Returns:
+        list: Up to page_size article dicts without trigger_type
+    """
+    start = (page - 1) * page_size
+    count = max(0, min(page_size, total_results - start))
+    rng = random.Random(f"{seed}|{query}|{page}")
+    end = datetime.now(timezone.utc)
+    articles = []
+    for i in range(count):
+        article = generate_article(
+            rng,
+            f"{zlib.crc32(query.encode())}-{start + i}",
+            end - timedelta(hours=start + i),
+        )
+        article.pop("trigger_type")
+        articles.append(article)
+    return articles
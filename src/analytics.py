@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+from src.metrics import metrics
+
+# Columns every prepared frame has, even when there are no articles
+FRAME_COLUMNS = ["url", "title", "source_name", "publishedAt", "date", "trigger_type"]
+
+# A trigger spikes when its weekly count grows by at least this share over the
+# previous week (or appears from nothing), with at least SPIKE_MIN_ARTICLES
+SPIKE_MIN_CHANGE = 0.5
+SPIKE_MIN_ARTICLES = 5
+
+
+@metrics.timed("analytics.prepare_articles_frame")
+def prepare_articles_frame(articles, trigger_order=None):
+    """
+    Build the normalized article DataFrame used by the dashboard
+
+    Args:
+        articles: Article dicts, either flat store rows (with source_name) or
+            NewsAPI articles (with a nested source dict)
+        trigger_order: Optional list of trigger names for the categorical order
+
+    Returns:
+        DataFrame: One row per article with a datetime index on publishedAt,
+            a date column, a flat source_name and a categorical trigger_type
+    """
+    df = pd.DataFrame(articles)
+    if df.empty:
+        return pd.DataFrame(columns=FRAME_COLUMNS)
+
+    # Flatten the nested source dict without a Python-level apply
+    if "source_name" not in df.columns:
+        df["source_name"] = df["source"].str.get("name")
+    if isinstance(df["source_name"].dtype, pd.CategoricalDtype):
+        # Snapshot frames keep the source dictionary-encoded
+        if "Unknown" not in df["source_name"].cat.categories:
+            df["source_name"] = df["source_name"].cat.add_categories("Unknown")
+    df["source_name"] = df["source_name"].fillna("Unknown")
+
+    df["publishedAt"] = pd.to_datetime(df["publishedAt"], utc=True)
+    df["date"] = df["publishedAt"].dt.date
+    df.index = pd.DatetimeIndex(df["publishedAt"], name="published")
+
+    if "trigger_type" in df.columns:
+        df["trigger_type"] = pd.Categorical(
+            df["trigger_type"], categories=trigger_order, ordered=bool(trigger_order)
+        )
+    return df
+
+
+def apply_trigger_labels(df, labels, trigger_order=None):
+    """
+    Re-tag a prepared frame with new trigger types
+
+    Args:
+        df: Frame from prepare_articles_frame
+        labels: Dict of url -> trigger name (or None when nothing matched)
+        trigger_order: Optional list of trigger names for the categorical order
+
+    Returns:
+        DataFrame: A copy with the new trigger_type, without unmatched articles
+    """
+    df = df.assign(
+        trigger_type=pd.Categorical(
+            df["url"].map(labels),
+            categories=trigger_order,
+            ordered=bool(trigger_order),
+        )
+    )
+    return df[df["trigger_type"].notna()]
+
+
+@metrics.timed("analytics.compute_aggregates")
+def compute_aggregates(df):
+    """
+    Precompute the counts behind the Analytics charts and the filter options
+
+    Returns:
+        dict: trigger_counts, articles_per_day, source_counts (top 10),
+            trigger_options and source_options
+    """
+    aggregates = {
+        "articles_per_day": df.groupby("date").size().reset_index(name="count"),
+        "source_counts": df["source_name"].value_counts().head(10),
+        "source_options": df["source_name"].unique(),
+    }
+    if "trigger_type" in df.columns:
+        aggregates["trigger_counts"] = df["trigger_type"].value_counts()
+        aggregates["trigger_options"] = df["trigger_type"].dropna().unique()
+    return aggregates
+
+
+def compute_company_counts(df, company_tags, limit=15):
+    """
+    Count the articles mentioning each company
+
+    Args:
+        df: Frame from prepare_articles_frame
+        company_tags: Dicts with url and company, e.g. from ArticleStore.query_companies
+        limit: Number of companies to keep
+
+    Returns:
+        Series: Article counts of the top companies, indexed by company name
+    """
+    tags = pd.DataFrame(company_tags, columns=["url", "company"])
+    tags = tags[tags["url"].isin(df["url"])]
+    return tags["company"].value_counts().head(limit)
+
+
+def compute_watchlist_summary(df, hits, recent_since=None):
+    """
+    Articles mentioning each watchlist account, most recently mentioned first
+
+    Args:
+        df: Frame from prepare_articles_frame
+        hits: Dicts with url, account and publishedAt, e.g. from
+            ArticleStore.query_watchlist_hits
+        recent_since: ISO timestamp; articles published since then count as new
+
+    Returns:
+        DataFrame: account, articles, new (articles since recent_since) and
+            latest (publishedAt of the newest article)
+    """
+    hits = pd.DataFrame(hits, columns=["url", "account", "publishedAt"])
+    hits = hits[hits["url"].isin(df["url"])]
+    summary = (
+        hits.groupby("account")
+        .agg(articles=("url", "nunique"), latest=("publishedAt", "max"))
+        .reset_index()
+    )
+    recent = hits[hits["publishedAt"] >= recent_since] if recent_since else hits[:0]
+    summary["new"] = (
+        summary["account"]
+        .map(recent.groupby("account")["url"].nunique())
+        .fillna(0)
+        .astype(int)
+    )
+    summary["latest"] = pd.to_datetime(summary["latest"], utc=True, format="ISO8601")
+    return summary.sort_values(["latest", "articles"], ascending=False)[
+        ["account", "articles", "new", "latest"]
+    ].reset_index(drop=True)
+
+
+def compute_weekly_trends(rows, since, until, trigger_order=None):
+    """
+    Weekly article counts per trigger from daily rollup rows
+    Weeks are the 7-day periods ending at until, like compute_week_over_week,
+    so the latest week is complete; a partial week at the start of the period
+    is dropped rather than plotted as a dip.
+
+    Args:
+        rows: Dicts with day, trigger_type and articles, e.g. from
+            ArticleStore.query_rollup(group_by=("day", "trigger_type"))
+        since: First day of the period (YYYY-MM-DD)
+        until: Last day of the period (YYYY-MM-DD)
+        trigger_order: Optional list of trigger names, in display order
+
+    Returns:
+        DataFrame: week (start date), trigger_type and articles, with zero
+            counts for weeks without articles
+    """
+    df = pd.DataFrame(rows, columns=["day", "trigger_type", "articles"])
+    until = pd.Timestamp(until)
+    full_weeks = max(1, ((until - pd.Timestamp(since)).days + 1) // 7)
+    # Week 0 is the 7 days up to until, week 1 the 7 days before, ...
+    df["week"] = (until - pd.to_datetime(df["day"])).dt.days // 7
+    df = df[df["week"].between(0, full_weeks - 1)]
+    table = df.pivot_table(
+        index="week",
+        columns="trigger_type",
+        values="articles",
+        aggfunc="sum",
+        fill_value=0,
+    )
+    triggers = [t for t in trigger_order or [] if t in table.columns]
+    table = table.reindex(
+        index=range(full_weeks - 1, -1, -1),
+        columns=triggers + [t for t in table.columns if t not in triggers],
+        fill_value=0,
+    )
+    table.index = until - pd.to_timedelta(table.index * 7 + 6, unit="D")
+    table.index.name = "week"
+    return table.stack().rename("articles").reset_index()
+
+
+def compute_week_over_week(rows, until, trigger_order=None):
+    """
+    Articles per trigger in the last 7 days up to until vs the 7 days before
+
+    Args:
+        rows: Dicts with day, trigger_type and articles from the daily rollup
+        until: Last day of the current week (YYYY-MM-DD)
+        trigger_order: Optional list of trigger names, in display order
+
+    Returns:
+        DataFrame: this_week, last_week, change (share, NaN without a previous
+            week) and spike, indexed by trigger_type
+    """
+    df = pd.DataFrame(rows, columns=["day", "trigger_type", "articles"])
+    age = (pd.Timestamp(until) - pd.to_datetime(df["day"])).dt.days
+    counts = pd.DataFrame(
+        {
+            "this_week": df[age.between(0, 6)]
+            .groupby("trigger_type")["articles"]
+            .sum(),
+            "last_week": df[age.between(7, 13)]
+            .groupby("trigger_type")["articles"]
+            .sum(),
+        }
+    )
+    if trigger_order:
+        counts = counts.reindex(
+            [t for t in trigger_order if t in counts.index]
+            + [t for t in counts.index if t not in trigger_order]
+        )
+    counts = counts.fillna(0).astype(int)
+    counts["change"] = counts["this_week"] / counts["last_week"].replace(0, np.nan) - 1
+    # A trigger appearing from nothing only counts once there is a previous week
+    appeared = (counts["last_week"] == 0) & (counts["last_week"].sum() > 0)
+    counts["spike"] = (counts["this_week"] >= SPIKE_MIN_ARTICLES) & (
+        appeared | (counts["change"] >= SPIKE_MIN_CHANGE)
+    )
+    return counts
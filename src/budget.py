@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from src.files import file_lock, write_json_atomic
+from src.metrics import metrics
+
+# Persistent request counter and per-query yield statistics
+DEFAULT_BUDGET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "request_budget.json"
+)
+
+# NewsAPI free tier allowance, reset daily (UTC)
+DAILY_REQUEST_LIMIT = int(os.getenv("NEWS_API_DAILY_LIMIT", "100"))
+
+# Weight of the latest fetch in the moving average of new articles per query
+YIELD_SMOOTHING = 0.3
+
+# Back-off after a 429 / rateLimited response, doubled when the limit is hit
+# again after a back-off has passed
+MIN_BACKOFF_SECONDS = 60
+MAX_BACKOFF_SECONDS = 60 * 60
+
+
+class QuotaExceededError(Exception):
+    """Raised instead of calling NewsAPI when the daily budget is used up"""
+
+
+class RateLimitedError(QuotaExceededError):
+    """Raised instead of calling NewsAPI while backing off after a 429"""
+
+
+def is_rate_limit_error(error):
+    """True if an exception from the NewsAPI client is a 429 / rateLimited"""
+    # Imported here so importing this module doesn't pull in requests
+    from newsapi.newsapi_exception import NewsAPIException
+
+    if isinstance(error, NewsAPIException):
+        return (error.get_exception() or {}).get("code") == "rateLimited"
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+class RequestBudget:
+    """
+    Daily NewsAPI request budget with a persistent counter
+    Also keeps a moving average of how many new articles each query key
+    produced, so the remaining budget can go to the queries that pay off most.
+    The state file is shared by the dashboard and the ingestion service: every
+    update re-reads it and writes it back under a file lock, so processes
+    never overwrite each other's counts.
+
+    Args:
+        path: JSON file the counter and statistics are kept in
+        daily_limit: Requests allowed per UTC day
+    """
+
+    def __init__(self, path=DEFAULT_BUDGET_PATH, daily_limit=DAILY_REQUEST_LIMIT):
+        self.path = path
+        self.daily_limit = daily_limit
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading request budget: {e}")
+        return {}
+
+    def _save(self):
+        write_json_atomic(self.path, self._state, indent=2, sort_keys=True)
+
+    def _refresh(self):
+        self._state = self._load()
+        self._roll_over()
+
+    @contextmanager
+    def _update(self):
+        """Read the latest shared state under the file lock and save it after"""
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            yield self._state
+            self._save()
+
+    def _roll_over(self):
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self._state.get("date") != today:
+            self._state["date"] = today
+            self._state["used"] = 0
+
+    def used(self):
+        """Requests spent today, by every process sharing the budget"""
+        with self._lock:
+            self._refresh()
+            return self._state["used"]
+
+    def remaining(self):
+        """Requests left today"""
+        return max(0, self.daily_limit - self.used())
+
+    def backoff_remaining(self):
+        """Seconds left before NewsAPI may be called again after a 429"""
+        with self._lock:
+            self._refresh()
+            return max(0.0, self._state.get("backoff_until", 0) - time.time())
+
+    def acquire(self):
+        """
+        Reserve one request
+
+        Raises:
+            RateLimitedError: While backing off after a 429
+            QuotaExceededError: If today's budget is used up
+        """
+        with self._update() as state:
+            if state.get("backoff_until", 0) > time.time():
+                raise RateLimitedError("Backing off after NewsAPI rate limit")
+            if state["used"] >= self.daily_limit:
+                raise QuotaExceededError(
+                    f"Daily NewsAPI budget of {self.daily_limit} requests used up"
+                )
+            state["used"] += 1
+
+    def rate_limited(self):
+        """
+        Record a 429 and back off
+        Requests already in flight when the limit was hit get their 429s during
+        the same back-off; only a 429 after it has passed doubles the delay.
+        """
+        with self._update() as state:
+            if state.get("backoff_until", 0) > time.time():
+                return
+            backoff = min(
+                state.get("backoff_seconds", MIN_BACKOFF_SECONDS // 2) * 2,
+                MAX_BACKOFF_SECONDS,
+            )
+            state["backoff_seconds"] = backoff
+            state["backoff_until"] = time.time() + backoff
+
+    def succeeded(self):
+        """Reset the back-off delay after a successful request"""
+        if "backoff_seconds" not in self._state:
+            return
+        with self._update() as state:
+            state.pop("backoff_seconds", None)
+
+    def record_yield(self, key, new_articles):
+        """Fold the number of new articles a query produced into its average"""
+        with self._update() as state:
+            yields = state.setdefault("yields", {})
+            previous = yields.get(key)
+            yields[key] = (
+                float(new_articles)
+                if previous is None
+                else YIELD_SMOOTHING * new_articles + (1 - YIELD_SMOOTHING) * previous
+            )
+
+    def plan(self, keys, requests_per_key=1):
+        """
+        Choose which query keys to spend the remaining budget on
+
+        Queries never fetched before go first, then the best average yield.
+        Ties keep the given order. Each key is budgeted at requests_per_key,
+        so paging a planned query never starves another of its first page.
+
+        Args:
+            keys: Query keys to choose from
+            requests_per_key: Requests a query may cost, e.g. its page limit
+
+        Returns:
+            list: The keys to fetch, in priority order
+        """
+        remaining = self.remaining()
+        if self.backoff_remaining():
+            return []
+        yields = self._state.get("yields", {})
+        ranked = sorted(keys, key=lambda key: -yields.get(key, float("inf")))
+        return ranked[: remaining // requests_per_key]
+
+
+class BudgetedNewsApiClient:
+    """
+    Wrapper around NewsApiClient that spends a RequestBudget on each real API
+    call and backs off on 429 responses instead of retrying into the limit.
+
+    Args:
+        client: NewsApiClient instance
+        budget: RequestBudget instance
+    """
+
+    def __init__(self, client, budget):
+        self.client = client
+        self.budget = budget
+
+    def _call(self, method, params):
+        self.budget.acquire()
+        metrics.increment("newsapi.requests")
+        try:
+            with metrics.span(f"newsapi.{method.__name__}"):
+                response = method(**params)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                metrics.increment("newsapi.rate_limited")
+                self.budget.rate_limited()
+                raise RateLimitedError("NewsAPI rate limit reached") from e
+            metrics.error("newsapi", e)
+            raise
+        self.budget.succeeded()
+        return response
+
+    def get_everything(self, **params):
+        return self._call(self.client.get_everything, params)
+
+    def get_top_headlines(self, **params):
+        return self._call(self.client.get_top_headlines, params)
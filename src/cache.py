@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from src.metrics import metrics
+
+# Default cache location, next to the saved news data
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "newsapi_cache.db"
+)
+
+# Time-to-live in seconds for each NewsAPI endpoint
+DEFAULT_TTLS = {
+    "everything": 6 * 60 * 60,
+    "top_headlines": 30 * 60,
+}
+
+# Size cap for stored (compressed) responses, least recently used are evicted first
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Seconds a session may hold the lease on a request it is fetching; longer than
+# a request with its retries takes, and a crashed holder's lease expires after it
+LEASE_SECONDS = 90
+
+# Seconds between cache checks while another session fetches the same request
+LEASE_POLL_SECONDS = 0.1
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache for NewsAPI responses
+    Responses are stored in SQLite, addressed by a hash of the endpoint and its
+    request parameters (query, region, date window, sort order, ...).
+
+    Args:
+        path: SQLite database file
+        ttls: Dict of endpoint -> time-to-live in seconds (merged over DEFAULT_TTLS)
+        max_bytes: Maximum total size of stored responses before LRU eviction
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttls=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_accessed "
+                "ON responses (last_accessed)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS leases (
+                    key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def make_key(endpoint, params):
+        """Content address for a request: sha256 of the endpoint and sorted params"""
+        params = {k: v for k, v in params.items() if v is not None}
+        payload = json.dumps([endpoint, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, endpoint, params):
+        """Return the cached response, or None if missing or expired"""
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        ttl = self.ttls.get(endpoint, 0)
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] < ttl:
+                conn.execute(
+                    "UPDATE responses SET last_accessed = ? WHERE key = ?", (now, key)
+                )
+            else:
+                if row:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                metrics.increment("cache.misses")
+                return None
+            self.hits += 1
+        metrics.increment("cache.hits")
+        return json.loads(zlib.decompress(row[0]))
+
+    def contains(self, endpoint, params):
+        """True if a fresh response is cached, without counting a hit or miss"""
+        key = self.make_key(endpoint, params)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return bool(row) and time.time() - row[0] < self.ttls.get(endpoint, 0)
+
+    def set(self, endpoint, params, response):
+        """Store a response and evict least recently used entries over the size cap"""
+        key = self.make_key(endpoint, params)
+        body = zlib.compress(json.dumps(response).encode("utf-8"))
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, body, size, created_at, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), now, now),
+            )
+            self._evict(conn)
+
+    def acquire_lease(self, endpoint, params, owner, ttl=LEASE_SECONDS):
+        """
+        Claim the right to fetch a request, shared by every process using the cache
+        The lease is a row in the cache database, so dashboard sessions and the
+        ingestion service agree on who is fetching what.
+
+        Args:
+            endpoint: NewsAPI endpoint name
+            params: Request parameters
+            owner: Identifier of the caller, used to release the lease
+            ttl: Seconds until the lease expires if it isn't released
+
+        Returns:
+            bool: True if the caller now holds the lease, False if someone else
+                holds an unexpired lease on the same request
+        """
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.expires_at < ?",
+                (key, owner, now + ttl, now),
+            )
+            return cursor.rowcount == 1
+
+    def release_lease(self, endpoint, params, owner):
+        """Give up a lease taken with acquire_lease"""
+        key = self.make_key(endpoint, params)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def _evict(self, conn):
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_accessed ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def stats(self):
+        """Hit/miss counters for this process plus current on-disk usage"""
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+class CachedNewsApiClient:
+    """
+    Drop-in wrapper around NewsApiClient that serves repeated requests from a
+    ResponseCache. Only successful ("status": "ok") responses are cached, and
+    responses served from the cache are marked with "fromCache": True.
+
+    Identical requests in flight at the same time are coalesced: the first
+    caller takes a lease on the request and fetches it, later callers (other
+    dashboard sessions or processes sharing the cache) wait for its response
+    to land in the cache instead of spending another API call on it.
+
+    Args:
+        client: NewsApiClient instance used on cache misses
+        cache: ResponseCache instance
+    """
+
+    def __init__(self, client, cache):
+        self.client = client
+        self.cache = cache
+
+    def _from_cache(self, endpoint, params):
+        response = self.cache.get(endpoint, params)
+        if response is not None:
+            response["fromCache"] = True
+        return response
+
+    def _coalesced(self, endpoint, params):
+        """Response another caller fetched while we waited, or None"""
+        if not self.cache.contains(endpoint, params):
+            return None
+        response = self._from_cache(endpoint, params)
+        if response is not None:
+            metrics.increment("cache.coalesced")
+        return response
+
+    def _cached_call(self, endpoint, method, params):
+        response = self._from_cache(endpoint, params)
+        if response is not None:
+            return response
+
+        owner = f"{os.getpid()}-{threading.get_ident()}"
+        waited = False
+        while not self.cache.acquire_lease(endpoint, params, owner):
+            # Someone else is fetching this request; wait for their response.
+            # If it fails nothing is cached, and the next caller to get the
+            # lease fetches it again.
+            waited = True
+            time.sleep(LEASE_POLL_SECONDS)
+            response = self._coalesced(endpoint, params)
+            if response is not None:
+                return response
+
+        try:
+            # The previous holder may have finished just before we got the lease
+            response = self._coalesced(endpoint, params) if waited else None
+            if response is None:
+                response = method(**params)
+                if response and response.get("status") == "ok":
+                    self.cache.set(endpoint, params, response)
+        finally:
+            self.cache.release_lease(endpoint, params, owner)
+        return response
+
+    def get_everything(self, **params):
+        return self._cached_call("everything", self.client.get_everything, params)
+
+    def get_top_headlines(self, **params):
+        return self._cached_call("top_headlines", self.client.get_top_headlines, params)
@@ -0,0 +1,161 @@
+import hashlib
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from src.query import tokenize
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Signature length, split into LSH bands of BAND_ROWS rows each. 16 bands of 4
+# rows make pairs above roughly 0.5 Jaccard similarity likely to collide.
+NUM_PERMUTATIONS = 64
+BAND_ROWS = 4
+
+# Estimated Jaccard similarity at which two articles count as near-duplicates
+SIMILARITY_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+
+def article_text(article):
+    """Text an article's near-duplicate signature is built from"""
+    return f"{article.get('title') or ''} {article.get('description') or ''}"
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Set of hashed word n-grams of a text"""
+    words = tokenize(text)
+    if not words:
+        return set()
+    if len(words) < size:
+        # Short texts become a single shingle
+        size = len(words)
+    return {
+        zlib.crc32(" ".join(words[i : i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles
+    Uses universal hashing (a * x + b) mod p with fixed seeded coefficients, so
+    signatures are stable across runs and processes and can be stored.
+
+    Args:
+        num_permutations: Signature length
+        seed: Seed for the hash coefficients
+    """
+
+    def __init__(self, num_permutations=NUM_PERMUTATIONS, seed=1):
+        rng = np.random.RandomState(seed)
+        prime = int(_MERSENNE_PRIME)
+        self.a = rng.randint(1, prime, size=(num_permutations, 1)).astype(np.uint64)
+        self.b = rng.randint(0, prime, size=(num_permutations, 1)).astype(np.uint64)
+        self.num_permutations = num_permutations
+
+    def signature(self, text):
+        """uint32 signature array, or None if the text has no words"""
+        hashed = shingles(text)
+        if not hashed:
+            return None
+        values = np.fromiter(hashed, dtype=np.uint64) % _MERSENNE_PRIME
+        permuted = (self.a * values[None, :] + self.b) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(signature_a, signature_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(signature_a == signature_b))
+
+
+def band_keys(signature, rows=BAND_ROWS):
+    """One integer bucket key per LSH band of a signature"""
+    keys = []
+    for start in range(0, len(signature), rows):
+        digest = hashlib.blake2b(
+            signature[start : start + rows].tobytes(), digest_size=7
+        ).digest()
+        keys.append(int.from_bytes(digest, "big"))
+    return keys
+
+
+class LSHIndex:
+    """
+    Locality-sensitive hashing over MinHash signatures
+    Only items sharing at least one band bucket are compared, so finding the
+    near-duplicates of an item doesn't scan every other item.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.buckets = defaultdict(list)
+        self.signatures = {}
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for band, bucket in enumerate(band_keys(signature)):
+            self.buckets[(band, bucket)].append(key)
+
+    def query(self, signature):
+        """The most similar indexed key above the threshold, or None"""
+        best_key, best_similarity = None, self.threshold
+        candidates = set()
+        for band, bucket in enumerate(band_keys(signature)):
+            candidates.update(self.buckets.get((band, bucket), ()))
+        for key in candidates:
+            score = similarity(signature, self.signatures[key])
+            if score >= best_similarity:
+                best_key, best_similarity = key, score
+        return best_key
+
+
+def find_near_duplicates(articles, hasher=None, threshold=SIMILARITY_THRESHOLD):
+    """
+    Cluster syndicated copies of the same story
+
+    Args:
+        articles: Article dicts with title/description
+        hasher: Optional MinHasher
+        threshold: Estimated Jaccard similarity for near-duplicates
+
+    Returns:
+        list: For each article, the index of its canonical article (the first
+            one of its cluster), or its own index if it is canonical
+    """
+    hasher = hasher or MinHasher()
+    index = LSHIndex(threshold)
+    canonical = []
+    for i, article in enumerate(articles):
+        signature = hasher.signature(article_text(article))
+        match = index.query(signature) if signature is not None else None
+        if match is None:
+            canonical.append(i)
+            if signature is not None:
+                index.add(i, signature)
+        else:
+            canonical.append(match)
+    return canonical
+
+
+def collapse_near_duplicates(articles, threshold=SIMILARITY_THRESHOLD):
+    """
+    Keep one canonical article per near-duplicate cluster
+
+    Returns:
+        list: Canonical articles in their original order, each with the URLs of
+            its dropped copies under "duplicate_urls"
+    """
+    canonical = find_near_duplicates(articles, threshold=threshold)
+    kept = []
+    for i, article in enumerate(articles):
+        if canonical[i] == i:
+            kept.append(article)
+        else:
+            articles[canonical[i]].setdefault("duplicate_urls", []).append(
+                article.get("url")
+            )
+    return kept
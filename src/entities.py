@@ -0,0 +1,341 @@
+import hashlib
+import os
+import re
+
+from src.matcher import AhoCorasick
+
+# Known companies and their aliases, one per line
+GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "config", "company_gazetteer.txt"
+)
+
+# Bumped when the extraction rules change, so stored articles are re-tagged
+EXTRACTOR_VERSION = 1
+
+# Articles tagged per store transaction
+BATCH_SIZE = 500
+
+# Article fields company names are extracted from
+ENTITY_FIELDS = ["title", "description"]
+
+# Legal forms that end a company name; dropped from the stored name
+LEGAL_SUFFIXES = {
+    "Inc",
+    "Incorporated",
+    "Ltd",
+    "Limited",
+    "Corp",
+    "Corporation",
+    "Co",
+    "plc",
+    "PLC",
+    "LLC",
+    "LLP",
+    "Pte",
+    "GmbH",
+    "AG",
+    "SA",
+    "NV",
+    "BV",
+    "Bhd",
+    "Tbk",
+}
+
+# Words that end an organisation name; kept as part of the stored name
+ORG_SUFFIXES = {
+    "Group",
+    "Holdings",
+    "Technologies",
+    "Technology",
+    "Therapeutics",
+    "Pharmaceuticals",
+    "Biotech",
+    "Systems",
+    "Labs",
+    "Bank",
+    "Capital",
+    "Ventures",
+    "Industries",
+    "Solutions",
+    "Networks",
+    "Robotics",
+    "Semiconductor",
+    "Healthcare",
+}
+
+NAME_SUFFIXES = LEGAL_SUFFIXES | ORG_SUFFIXES
+
+# Headline verbs (base form) that follow the company the article is about
+ACTION_VERBS = {
+    "announce",
+    "launch",
+    "unveil",
+    "introduce",
+    "expand",
+    "open",
+    "acquire",
+    "raise",
+    "secure",
+    "partner",
+    "sign",
+    "complete",
+    "appoint",
+    "name",
+    "enter",
+    "receive",
+    "win",
+    "file",
+    "report",
+    "achieve",
+    "debut",
+    "team",
+    "invest",
+    "close",
+    "select",
+    "deploy",
+    "release",
+    "showcase",
+    "strengthen",
+    "extend",
+    "join",
+    "list",
+    "obtain",
+    "gain",
+}
+
+# Capitalized words that start a headline or sentence but are not names
+NOT_NAMES = {
+    "A",
+    "An",
+    "The",
+    "New",
+    "How",
+    "Why",
+    "What",
+    "When",
+    "Where",
+    "Who",
+    "This",
+    "These",
+    "That",
+    "Our",
+    "Its",
+    "Report",
+    "Reports",
+    "Exclusive",
+    "Breaking",
+    "Update",
+    "Watch",
+    "Study",
+    "Press",
+    "Release",
+    "Today",
+    "Company",
+    "Startup",
+    "Firm",
+    "Market",
+}
+
+NAME_TOKEN_RE = re.compile(r"[\w&*.'’®™-]+")
+GAZETTEER_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+# Headlines are split into clauses at colons, pipes, dashes and semicolons
+CLAUSE_RE = re.compile(r"\s*[:|;–—]\s*|\s+-\s+")
+# Names never span commas, brackets, quotes or sentence ends
+PHRASE_RE = re.compile(r"[,;:()\"“”!?|–—]|\.\s|\s-\s")
+
+
+def _clean(token):
+    return token.strip(".,'’-").replace("®", "").replace("™", "")
+
+
+def _is_name_token(token):
+    return bool(token) and (token[0].isupper() or token[0].isdigit())
+
+
+def _is_action(word):
+    word = word.lower()
+    return (
+        word in ACTION_VERBS
+        or word.endswith("s")
+        and word[:-1] in ACTION_VERBS
+        or word.endswith("es")
+        and word[:-2] in ACTION_VERBS
+    )
+
+
+def load_gazetteer(path=GAZETTEER_PATH):
+    """
+    Read the company gazetteer
+
+    Returns:
+        dict: Alias -> canonical company name (canonical names map to themselves)
+    """
+    aliases = {}
+    if not os.path.exists(path):
+        return aliases
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [name.strip() for name in line.split("|") if name.strip()]
+            for name in names:
+                aliases[name] = names[0]
+    return aliases
+
+
+class CompanyExtractor:
+    """
+    Offline company name extraction from article headlines and descriptions
+    Combines a gazetteer of known companies (matched with one AhoCorasick pass)
+    with two rules over capitalized word runs: the subject of a headline verb
+    ("Xanadu Expands ...", "Abaxx to Launch ...") and names ending in a legal
+    or organisation suffix ("MoneyHero Group", "Starks Network Ltd").
+
+    Args:
+        gazetteer_path: Gazetteer file, see config/company_gazetteer.txt
+    """
+
+    def __init__(self, gazetteer_path=GAZETTEER_PATH):
+        self.aliases = load_gazetteer(gazetteer_path)
+        self._alias_names = list(self.aliases)
+        self.automaton = AhoCorasick(
+            tuple(GAZETTEER_TOKEN_RE.findall(alias)) for alias in self._alias_names
+        )
+        self._canonical = {alias.lower(): name for alias, name in self.aliases.items()}
+
+        digest = hashlib.sha1(repr(sorted(self.aliases.items())).encode("utf-8"))
+        # Stored tags are redone when either the rules or the gazetteer change
+        self.version = f"{EXTRACTOR_VERSION}:{digest.hexdigest()[:8]}"
+
+    def _normalize(self, tokens):
+        """Company name from a run of name tokens, or None if it isn't one"""
+        tokens = [_clean(t) for t in tokens]
+        while tokens and tokens[0] in NOT_NAMES:
+            tokens = tokens[1:]
+        while tokens and tokens[-1] in LEGAL_SUFFIXES:
+            tokens = tokens[:-1]
+        if not tokens or any(t.endswith(("'s", "’s")) for t in tokens):
+            return None
+        if all(t in NOT_NAMES or t.isdigit() for t in tokens):
+            return None
+        name = " ".join(tokens)
+        if len(name) < 2:
+            return None
+        return self._canonical.get(name.lower(), name)
+
+    def _headline_subjects(self, title):
+        names = []
+        for clause in CLAUSE_RE.split(title):
+            tokens = NAME_TOKEN_RE.findall(clause)
+            run = []
+            for i, token in enumerate(tokens):
+                if run and (
+                    _is_action(token)
+                    or token == "to"
+                    and i + 1 < len(tokens)
+                    and _is_action(tokens[i + 1])
+                ):
+                    name = self._normalize(run)
+                    if name:
+                        names.append(name)
+                    break
+                if not _is_name_token(token) or len(run) == 6:
+                    break
+                run.append(token)
+        return names
+
+    def _suffixed_names(self, text):
+        names = []
+        for phrase in PHRASE_RE.split(text):
+            tokens = NAME_TOKEN_RE.findall(phrase)
+            for i, token in enumerate(tokens):
+                if _clean(token) not in NAME_SUFFIXES:
+                    continue
+                start = i
+                while start > 0 and i - start < 4 and _is_name_token(tokens[start - 1]):
+                    start -= 1
+                if start < i:
+                    name = self._normalize(tokens[start : i + 1])
+                    if name:
+                        names.append(name)
+        return names
+
+    def _gazetteer_names(self, text):
+        found = self.automaton.find(GAZETTEER_TOKEN_RE.findall(text))
+        return [self.aliases[self._alias_names[i]] for i in sorted(found)]
+
+    def extract(self, article):
+        """
+        Company names mentioned in an article, most likely subject first
+
+        Returns:
+            list: Unique company names
+        """
+        title = article.get("title") or ""
+        texts = [article.get(field) or "" for field in ENTITY_FIELDS]
+        candidates = self._headline_subjects(title)
+        for text in texts:
+            candidates += self._suffixed_names(text)
+        for text in texts:
+            candidates += self._gazetteer_names(text)
+
+        names = list(dict.fromkeys(candidates))
+        # "Apparel Group" is dropped when "Apparel Group India" was found too
+        return [
+            name
+            for name in names
+            if not any(
+                other != name and other.startswith(name + " ") for other in names
+            )
+        ]
+
+
+def extract_companies(articles, extractor=None):
+    """
+    Extract company names from a batch of articles
+
+    Args:
+        articles: Article dicts with title/description
+        extractor: Optional CompanyExtractor
+
+    Returns:
+        list: The company names of each article
+    """
+    extractor = extractor or CompanyExtractor()
+    return [extractor.extract(article) for article in articles]
+
+
+def update_company_index(store, extractor=None, batch_size=BATCH_SIZE):
+    """
+    Tag the stored articles not processed yet with the companies they mention
+    Progress is tracked by article id in the store, so each article is
+    processed once; changing the extractor version re-tags everything.
+
+    Args:
+        store: ArticleStore to read and tag
+        extractor: Optional CompanyExtractor
+        batch_size: Articles per write transaction
+
+    Returns:
+        int: Number of articles processed
+    """
+    extractor = extractor or CompanyExtractor()
+    if store.get_meta("companies_version") != extractor.version:
+        store.reset_companies(extractor.version)
+
+    last_article_id = int(store.get_meta("companies_last_article_id", 0))
+    articles = sorted(
+        store.query_articles(
+            columns=["id", "title", "description"], after_id=last_article_id
+        ),
+        key=lambda article: article["id"],
+    )
+    for start in range(0, len(articles), batch_size):
+        batch = articles[start : start + batch_size]
+        companies = extract_companies(batch, extractor)
+        store.add_article_companies(
+            {article["id"]: names for article, names in zip(batch, companies)},
+            last_article_id=batch[-1]["id"],
+        )
+    return len(articles)
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Process umask, read once at import since reading it means briefly changing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    Write a file via a temporary file in the same directory, renamed into place
+    Readers never see a half-written file, and concurrent writers (dashboard
+    sessions, the ingestion service) each write their own temporary file, so
+    the last complete write wins instead of the writes interleaving. The file
+    keeps the mode of the file it replaces (or gets the umask default), not
+    mkstemp's owner-only mode, so services running as other users can read it.
+
+    Args:
+        path: Final file path
+
+    Yields:
+        str: Temporary path to write to; it replaces path if the block succeeds
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    os.close(fd)
+    try:
+        yield tmp_path
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Dump data as JSON to path with atomic_write; dump_kwargs go to json.dump"""
+    with atomic_write(path) as tmp_path:
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock on path shared by every process, held for the enclosed block
+    The lock is taken on a separate path + ".lock" file, so the data file
+    itself can still be replaced with atomic_write while it is held.
+
+    Args:
+        path: File the lock protects
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a+") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -1,16 +1,102 @@
+import hashlib
 import json
 import os
-from datetime import datetime, timedelta
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import partial
 
 from dotenv import load_dotenv
-from newsapi import NewsApiClient
+
+from src.budget import BudgetedNewsApiClient, QuotaExceededError, RequestBudget
+from src.cache import CachedNewsApiClient, ResponseCache
+from src.files import file_lock, write_json_atomic
+from src.matcher import query_hashes
+from src.metrics import metrics
+from src.pipeline import (
+    drop_duplicate_urls,
+    drop_near_duplicates,
+    pipeline,
+    store_sink,
+    write_jsonl,
+)
+from src.regions import RegionTagger, tag_regions
+from src.store import ArticleStore
+from src.triggers import SALES_TRIGGER_QUERIES
 
 # Load environment variables from config/.env
 config_env_path = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "config", ".env"
 )
 load_dotenv(dotenv_path=config_env_path)
-newsapi = NewsApiClient(api_key=os.getenv("NEWS_API_KEY"))
+
+# Repeated requests are served from the on-disk response cache; the rest
+# spend the daily request budget
+response_cache = ResponseCache()
+request_budget = RequestBudget()
+
+# The NewsAPI client, built on first use by get_client
+newsapi = None
+_client_lock = threading.Lock()
+
+# Data directory for saved news and fetch state
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+# High-water marks (latest publishedAt) per trigger and region
+FETCH_STATE_FILE = os.path.join(DATA_DIR, "fetch_state.json")
+
+# Maximum number of NewsAPI requests in flight at once
+MAX_CONCURRENT_REQUESTS = int(os.getenv("NEWS_FETCH_CONCURRENCY", "8"))
+
+# NewsAPI's maximum page size, and how many pages a single query may walk
+PAGE_SIZE = 100
+MAX_PAGES = int(os.getenv("NEWS_MAX_PAGES", "5"))
+
+# Results NewsAPI serves per query: the free tier stops at 100, so paging past
+# it only wastes a request on a maximumResultsReached error
+MAX_RESULTS = int(os.getenv("NEWS_MAX_RESULTS", "100"))
+
+# Worst-case requests a trigger query costs, used to plan the daily budget
+REQUESTS_PER_QUERY = max(1, min(MAX_PAGES, -(-MAX_RESULTS // PAGE_SIZE)))
+
+# Another page is only requested if at least this share of the last page was
+# new articles scoring PAGE_MIN_RELEVANCE or more (stricter than the dashboard
+# default, since every extra page costs a request)
+MIN_PAGE_YIELD = 0.3
+PAGE_MIN_RELEVANCE = 35
+
+# Multi-region fetches send targeted region queries for regions with fewer
+# articles than this after the region-agnostic pass (0 disables them)
+SPARSE_REGION_MIN_ARTICLES = int(os.getenv("NEWS_SPARSE_REGION_MIN", "3"))
+
+
+def get_client():
+    """
+    The shared NewsAPI client, built on first use
+    Importing this module stays cheap: requests and the client are only loaded
+    when the first query is sent. Sequential and concurrent fetches share one
+    pooled keep-alive session with timeouts and retries (see src.transport).
+
+    Returns:
+        CachedNewsApiClient: Client with the response cache and request budget
+    """
+    global newsapi
+    if newsapi is None:
+        with _client_lock:
+            if newsapi is None:
+                from newsapi import NewsApiClient
+
+                from src.transport import build_session
+
+                client = NewsApiClient(
+                    api_key=os.getenv("NEWS_API_KEY"),
+                    session=build_session(pool_size=MAX_CONCURRENT_REQUESTS),
+                )
+                newsapi = CachedNewsApiClient(
+                    BudgetedNewsApiClient(client, request_budget), response_cache
+                )
+    return newsapi
 
 
 def fetch_news_by_query(query="Apple", days_back=30, sort_by="popularity"):
@@ -27,12 +113,13 @@ def fetch_news_by_query(query="Apple", days_back=30, sort_by="popularity"):
     to_date = datetime.now().strftime("%Y-%m-%d")
 
     try:
-        response = newsapi.get_everything(
-            q=query, from_param=from_date, to=to_date, sort_by=sort_by, language="en"
+        response = fetch_everything_pages(
+            everything_params(query, from_date, to_date, sort_by)
         )
         return response
     except Exception as e:
         print(f"Error fetching news: {e}")
+        metrics.error("fetch", e)
         return None
 
 
@@ -46,97 +133,575 @@ def fetch_top_headlines(country="sg", category=None):
         category: Category (business, technology, science, health, sports, entertainment, etc.)
     """
     try:
-        response = newsapi.get_top_headlines(country=country, category=category)
+        response = get_client().get_top_headlines(country=country, category=category)
         return response
     except Exception as e:
         print(f"Error fetching news: {e}")
+        metrics.error("fetch", e)
         return None
 
 
-def fetch_sales_triggers(days_back=7, sort_by="publishedAt", region=None):
+def load_fetch_state():
+    """Load the per trigger/region high-water marks used by incremental fetches"""
+    if os.path.exists(FETCH_STATE_FILE):
+        try:
+            with open(FETCH_STATE_FILE, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading fetch state: {e}")
+    return {}
+
+
+def save_fetch_state(state):
     """
-    Fetch sales trigger news for Patsnap's sales team
-    Searches for funding, acquisitions, leadership changes, product launches, etc.
+    Persist the per trigger/region high-water marks
+    The marks are merged into the saved ones under a file lock, keeping the
+    later mark per key, so the dashboard and the ingestion service saving at
+    the same time never roll back each other's progress.
+    """
+    with file_lock(FETCH_STATE_FILE):
+        merged = load_fetch_state()
+        for key, mark in state.items():
+            merged[key] = max(merged.get(key, ""), mark)
+        write_json_atomic(FETCH_STATE_FILE, merged, indent=2, sort_keys=True)
+
+
+def fetch_state_key(trigger_name, region, query):
+    """
+    Key for a high-water mark. The query text is hashed into the key so that
+    editing a trigger query starts again from the full date window.
+    """
+    query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()[:8]
+    return f"{trigger_name}|{region or 'Global'}|{query_hash}"
+
+
+def everything_params(query, from_date, to_date, sort_by):
+    """Parameters for the first page of a /everything request, as passed to the client"""
+    return {
+        "q": query,
+        "from_param": from_date,
+        "to": to_date,
+        "sort_by": sort_by,
+        "language": "en",
+        "page": 1,
+        "page_size": PAGE_SIZE,
+    }
+
+
+def page_yield(page_articles, new_articles, query, trigger_name=None):
+    """
+    Share of a page's articles that are new and score at least PAGE_MIN_RELEVANCE
 
     Args:
-        days_back: Number of days to look back
-        sort_by: Sort order (publishedAt recommended for timely triggers)
-        region: Optional region filter (e.g., 'Singapore', 'Asia', 'United States')
+        page_articles: Number of articles on the page
+        new_articles: The page's articles not seen on earlier pages
+        query: The query that produced them, for keyword scoring
+        trigger_name: Optional trigger, for its negative terms
+    """
+    if not page_articles or not new_articles:
+        return 0.0
+    # pandas is only loaded once a query actually pages
+    from src.analytics import prepare_articles_frame
+    from src.scoring import score_articles
+
+    df = prepare_articles_frame(new_articles)
+    if trigger_name:
+        df = df.assign(trigger_type=trigger_name)
+    scored = score_articles(
+        df,
+        trigger_queries={trigger_name: query} if trigger_name else None,
+        default_query=query,
+        now=datetime.now(timezone.utc),
+    )
+    relevant = int((scored["relevance"] >= PAGE_MIN_RELEVANCE).sum())
+    return relevant / page_articles
+
+
+def fetch_everything_pages(params, trigger_name=None, max_pages=MAX_PAGES):
+    """
+    Fetch a /everything query page by page at the maximum page size
+    Further pages are only requested while NewsAPI has more results (up to
+    MAX_RESULTS) and the last page was worth it: at least MIN_PAGE_YIELD of its articles were new
+    and relevant. Each extra page costs one request from the daily budget.
+
+    Args:
+        params: First page parameters from everything_params
+        trigger_name: Optional trigger the query belongs to, for scoring
+        max_pages: Maximum number of pages to request
 
     Returns:
-        dict: Combined news data with articles from all sales trigger queries
-    """
-    # Sales trigger queries with short names
-    # TODO: Need to be improved by Sales team feedback
-    trigger_queries = {
-        "Patent & IP": '(company OR startup OR firm OR corporation) AND (patent OR "intellectual property" OR "IP portfolio" OR trademark) AND (granted OR filed OR awarded OR secures)',
-        # "Funding": '(company OR startup) AND ("funding round" OR "Series A" OR "Series B" OR "raises" OR "secures funding" OR "venture capital")',
-        # "Acquisition": '(company OR firm) AND (acquisition OR merger OR "acquired by" OR "acquires" OR partnership)',
-        # "Leadership": '(company OR firm OR corporation) AND ("CEO" OR "CTO" OR "CFO") AND (appointment OR "appoints" OR hire OR "joins as" OR "named" OR "announces")',
-        "Product Launch": '(company OR startup OR firm) AND ("product launch" OR "launches" OR "unveils" OR "announces" OR "introduces" OR "new product")',
-        # "Regulatory": '(company OR firm) AND ("regulatory approval" OR "FDA approval" OR "receives approval" OR licensed OR certified)',
-        # "IPO": '(company OR startup) AND ("IPO" OR "going public" OR "files for IPO" OR "initial public offering" OR "stock listing")',
-        "Expansion": '(company OR startup OR firm) AND (expansion OR "opens office" OR "opening" OR "expands into" OR "enters market" OR "new location")',
+        dict: NewsAPI-style response with the articles of all fetched pages,
+            NewsAPI's totalResults for the query and the number of pages
+    """
+    response = get_client().get_everything(**params)
+    if not response or response.get("status") != "ok":
+        return response
+
+    total_results = response.get("totalResults", 0)
+    from_cache = bool(response.get("fromCache"))
+    articles = list(response.get("articles") or [])
+    seen_urls = {a.get("url") for a in articles}
+    page_articles, new_articles = len(articles), articles
+    page = 1
+
+    while (
+        page < max_pages
+        and page_articles >= params["page_size"]
+        and page * params["page_size"] < min(total_results, MAX_RESULTS)
+        and page_yield(page_articles, new_articles, params["q"], trigger_name)
+        >= MIN_PAGE_YIELD
+    ):
+        page += 1
+        try:
+            response = get_client().get_everything(**{**params, "page": page})
+        except Exception as e:
+            # Budget used up, or the plan's result cap reached: keep what we have
+            print(f"Stopped paging '{params['q']}' at page {page}: {e}")
+            metrics.error("fetch.paging", e)
+            page -= 1
+            break
+        if not response or response.get("status") != "ok":
+            page -= 1
+            break
+        from_cache = from_cache and bool(response.get("fromCache"))
+        page_results = response.get("articles") or []
+        new_articles = [a for a in page_results if a.get("url") not in seen_urls]
+        seen_urls.update(a.get("url") for a in new_articles)
+        articles.extend(new_articles)
+        page_articles = len(page_results)
+
+    result = {
+        "status": "ok",
+        "totalResults": total_results,
+        "articles": articles,
+        "pages": page,
     }
+    if from_cache:
+        result["fromCache"] = True
+    return result
 
-    # Add region filter if specified
-    queries_with_region = {}
-    if region:
-        for name, query in trigger_queries.items():
-            queries_with_region[name] = f"({query}) AND {region}"
-    else:
-        queries_with_region = trigger_queries
 
-    all_articles = []
+def iter_query_responses(
+    queries,
+    to_date,
+    sort_by="publishedAt",
+    max_workers=MAX_CONCURRENT_REQUESTS,
+    progress_callback=None,
+):
+    """
+    Run several NewsAPI /everything queries at the same time, yielding the
+    responses in query order as soon as they arrive
+    Requests are fanned out over a thread pool, so the total wall-clock time is
+    roughly that of the slowest single query instead of the sum of all of them.
+    A response that arrives early waits for those of the queries before it, so
+    an article returned by several triggers is always tagged with the first
+    one, whatever the network timing.
+
+    Args:
+        queries: List of (trigger_name, region, query, from_date) tuples, where
+            from_date is YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS
+        to_date: End of the date window (YYYY-MM-DD)
+        sort_by: Sort order (popularity, publishedAt, relevancy)
+        max_workers: Maximum number of requests in flight at once
+        progress_callback: Optional callable(completed, total), called from the
+            consuming thread after each query finishes
+
+    Yields:
+        tuple: (index into queries, response dict or None on error), in
+            query order
+    """
+    if not queries:
+        return
+
+    def run(trigger_name, query, from_date):
+        with metrics.span("fetch.query", trigger=trigger_name):
+            return fetch_everything_pages(
+                everything_params(query, from_date, to_date, sort_by), trigger_name
+            )
+
+    workers = max(1, min(max_workers, len(queries)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run, trigger_name, query, from_date): i
+            for i, (trigger_name, _, query, from_date) in enumerate(queries)
+        }
+        quota_errors = []
+        arrived = {}
+        next_index = 0
+        for completed, future in enumerate(as_completed(futures), 1):
+            # Drop the finished future so its response can be freed once consumed
+            i = futures.pop(future)
+            response = None
+            try:
+                response = future.result()
+            except QuotaExceededError as e:
+                # Budget used up or backing off: the rest fail fast without a request
+                quota_errors.append(e)
+            except Exception as e:
+                print(f"Error fetching news for '{queries[i][2]}': {e}")
+                metrics.error("fetch", e)
+            if progress_callback:
+                progress_callback(completed, len(queries))
+            arrived[i] = response
+            while next_index in arrived:
+                yield next_index, arrived.pop(next_index)
+                next_index += 1
+
+    if quota_errors:
+        print(f"Skipped {len(quota_errors)} queries: {quota_errors[0]}")
+        metrics.increment("fetch.quota_skipped", len(quota_errors))
+
+
+def fetch_queries_concurrently(
+    queries,
+    to_date,
+    sort_by="publishedAt",
+    max_workers=MAX_CONCURRENT_REQUESTS,
+    progress_callback=None,
+):
+    """
+    Run several NewsAPI /everything queries at the same time
+    See iter_query_responses for the arguments.
+
+    Returns:
+        list: One response dict (or None on error) per query, in input order
+    """
+    results = [None] * len(queries)
+    for i, response in iter_query_responses(
+        queries, to_date, sort_by, max_workers, progress_callback
+    ):
+        results[i] = response
+    return results
+
+
+def region_list(region):
+    """Normalize a region argument (None, a name or a list) to a list of names"""
+    if not region:
+        return []
+    if isinstance(region, str):
+        return [region]
+    return list(region)
+
+
+def plan_trigger_queries(
+    days_back, region, trigger_queries, incremental, sort_by, fetch_state
+):
+    """
+    Build the trigger x region queries and fit them into the request budget
+
+    Args:
+        fetch_state: High-water marks from load_fetch_state
+
+    Returns:
+        tuple: (queries to run as (trigger_name, region, query, from_date) tuples,
+            to_date, skipped query strings)
+    """
+    # Add region filter if specified, one query per trigger x region
+    regions = region_list(region) or [None]
+
     from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
     to_date = datetime.now().strftime("%Y-%m-%d")
 
-    for trigger_name, query in queries_with_region.items():
-        try:
-            response = newsapi.get_everything(
-                q=query,
-                from_param=from_date,
-                to=to_date,
-                sort_by=sort_by,
-                language="en",
+    queries = []
+    for name, trigger_query in trigger_queries.items():
+        for region_name in regions:
+            query = (
+                f"({trigger_query}) AND {region_name}" if region_name else trigger_query
             )
+            # Resume from the high-water mark if it is inside the date window;
+            # marks only bound what was fetched when results came newest first
+            high_water_mark = fetch_state.get(fetch_state_key(name, region_name, query))
+            query_from = from_date
+            if incremental and high_water_mark and sort_by == "publishedAt":
+                query_from = max(from_date, high_water_mark)
+            queries.append((name, region_name, query, query_from))
 
-            if response.get("status") == "ok" and response.get("articles"):
-                # Add source query tag to each article
-                for article in response["articles"]:
-                    article["trigger_type"] = (
-                        trigger_name  # Use short name instead of query
-                    )
-                all_articles.extend(response["articles"])
-                print(f"Found {len(response['articles'])} articles for: {query}")
-        except Exception as e:
-            print(f"Error fetching news for '{query}': {e}")
+    # Spend the remaining request budget on the queries that pay off most;
+    # cached queries cost nothing and always run
+    uncached = [
+        fetch_state_key(name, region_name, query)
+        for name, region_name, query, query_from in queries
+        if not response_cache.contains(
+            "everything", everything_params(query, query_from, to_date, sort_by)
+        )
+    ]
+    planned = set(request_budget.plan(uncached, REQUESTS_PER_QUERY))
+    skipped = set(uncached) - planned
+    skipped_queries = [q[2] for q in queries if fetch_state_key(*q[:3]) in skipped]
+    queries = [q for q in queries if fetch_state_key(*q[:3]) not in skipped]
+    if skipped_queries:
+        print(f"Request budget exhausted, skipping {len(skipped_queries)} queries")
+    return queries, to_date, skipped_queries
+
+
+def tag_trigger_articles(
+    responses, queries, fetch_state, stats=None, sort_by="publishedAt"
+):
+    """
+    Pipeline source stage: turn query responses into tagged articles
+    Tags each article with its trigger_type (and region), advances the
+    high-water marks and records each query's yield. The marks are only
+    advanced in fetch_state: the caller saves them once the articles are
+    stored, so a failed write is fetched again next time. A mark only
+    advances past a complete, newest-first response; after a relevancy or
+    popularity sort, or a response cut short of NewsAPI's totalResults, older
+    articles in the window may still be missing.
+
+    Args:
+        responses: Iterable of (index into queries, response) pairs
+        queries: The (trigger_name, region, query, from_date) tuples
+        fetch_state: High-water marks from load_fetch_state, updated in place
+        stats: Optional dict whose "totalResults" accumulates NewsAPI's
+            reported result counts
+        sort_by: Sort order the queries were sent with
+
+    Yields:
+        dict: Articles, grouped per response
+    """
+    for i, response in responses:
+        if stats is not None and response:
+            stats.setdefault("totalResults", 0)
+            stats["totalResults"] += response.get("totalResults", 0)
+        if not (
+            response and response.get("status") == "ok" and response.get("articles")
+        ):
             continue
+        trigger_name, region_name, query, _ = queries[i]
+        key = fetch_state_key(trigger_name, region_name, query)
+        # NewsAPI accepts YYYY-MM-DDTHH:MM:SS without the trailing Z
+        published = [a["publishedAt"].rstrip("Z")[:19] for a in response["articles"]]
+        previous = fetch_state.get(key, "")
+        complete = response.get("totalResults", 0) <= len(response["articles"])
+        if sort_by == "publishedAt" and complete:
+            fetch_state[key] = max([previous] + published)
+        # Articles past the previous high-water mark count as this query's yield
+        if not response.get("fromCache"):
+            request_budget.record_yield(key, sum(1 for p in published if p > previous))
+
+        print(f"Found {len(response['articles'])} articles for: {query}")
+        # Add source query tag to each article
+        for article in response["articles"]:
+            article["trigger_type"] = trigger_name  # Use short name instead of query
+            if region_name:
+                article["region"] = region_name
+            yield article
+
+
+def stream_multi_region(
+    days_back,
+    sort_by,
+    regions,
+    trigger_queries,
+    max_workers,
+    progress_callback,
+    incremental,
+    skipped_queries,
+    fetch_state,
+    stats=None,
+    sparse_region_min=SPARSE_REGION_MIN_ARTICLES,
+):
+    """
+    Pipeline source stage for multi-region fetches
+    Sends one region-agnostic query per trigger and assigns regions locally
+    with the region gazetteer, so API calls grow with the number of triggers
+    instead of triggers x regions. Regions with fewer than sparse_region_min
+    articles afterwards get targeted "(query) AND region" queries.
 
-    # Remove duplicates based on URL
+    Args:
+        regions: Region names to cover
+        skipped_queries: List extended with queries skipped for the budget
+        fetch_state: High-water marks, advanced in place
+        stats: Optional dict, see tag_trigger_articles
+        sparse_region_min: Articles below which a region gets targeted
+            queries (0 disables them)
+        See fetch_sales_triggers for the other arguments.
+
+    Yields:
+        dict: Unique tagged articles with a "regions" list
+    """
+    tagger = RegionTagger()
     seen_urls = set()
-    unique_articles = []
-    for article in all_articles:
-        if article.get("url") not in seen_urls:
-            seen_urls.add(article["url"])
-            unique_articles.append(article)
+
+    def run(query_regions):
+        queries, to_date, skipped = plan_trigger_queries(
+            days_back, query_regions, trigger_queries, incremental, sort_by, fetch_state
+        )
+        skipped_queries.extend(skipped)
+        responses = iter_query_responses(
+            queries,
+            to_date,
+            sort_by=sort_by,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+        )
+        return pipeline(
+            tag_trigger_articles(responses, queries, fetch_state, stats, sort_by),
+            partial(tag_regions, regions=regions, tagger=tagger),
+            partial(drop_duplicate_urls, seen_urls=seen_urls),
+        )
+
+    region_counts = Counter()
+    for article in run(None):
+        region_counts.update(article["regions"])
+        yield article
+
+    sparse = [r for r in regions if region_counts[r] < sparse_region_min]
+    if sparse:
+        print(f"Running targeted queries for sparse regions: {', '.join(sparse)}")
+        yield from run(sparse)
+
+
+def stream_sales_triggers(
+    days_back=7,
+    sort_by="publishedAt",
+    region=None,
+    trigger_queries=None,
+    max_workers=MAX_CONCURRENT_REQUESTS,
+    progress_callback=None,
+    incremental=False,
+    duplicate_links=None,
+    multi_region=True,
+    stats=None,
+    fetch_state=None,
+):
+    """
+    Streaming version of fetch_sales_triggers
+    Queries are planned right away; requests are only sent once the returned
+    stream is consumed, and articles flow through fetch -> tag -> URL dedup ->
+    near-duplicate dedup as each response arrives. Add further stages and a
+    sink from src.pipeline to process them without holding them all in memory.
+
+    Args:
+        duplicate_links: Optional dict filled with dropped near-duplicate
+            URL -> canonical URL
+        stats: Optional dict updated with NewsAPI's summed "totalResults"
+        See fetch_sales_triggers for the other arguments.
+
+    Returns:
+        tuple: (iterator of unique tagged articles, skipped query strings; in
+            multi-region mode the list grows as targeted queries are planned)
+    """
+    if trigger_queries is None:
+        trigger_queries = SALES_TRIGGER_QUERIES
+    if fetch_state is None:
+        fetch_state = load_fetch_state()
+
+    regions = region_list(region)
+    if multi_region and len(regions) > 1:
+        skipped_queries = []
+        source = stream_multi_region(
+            days_back,
+            sort_by,
+            regions,
+            trigger_queries,
+            max_workers,
+            progress_callback,
+            incremental,
+            skipped_queries,
+            fetch_state,
+            stats,
+        )
+    else:
+        queries, to_date, skipped_queries = plan_trigger_queries(
+            days_back, regions, trigger_queries, incremental, sort_by, fetch_state
+        )
+        responses = iter_query_responses(
+            queries,
+            to_date,
+            sort_by=sort_by,
+            max_workers=max_workers,
+            progress_callback=progress_callback,
+        )
+        source = pipeline(
+            tag_trigger_articles(responses, queries, fetch_state, stats, sort_by),
+            drop_duplicate_urls,
+        )
+    articles = pipeline(source, partial(drop_near_duplicates, links=duplicate_links))
+    return articles, skipped_queries
+
+
+def fetch_sales_triggers(
+    days_back=7,
+    sort_by="publishedAt",
+    region=None,
+    trigger_queries=None,
+    max_workers=MAX_CONCURRENT_REQUESTS,
+    progress_callback=None,
+    incremental=False,
+    multi_region=True,
+    fetch_state=None,
+):
+    """
+    Fetch sales trigger news for Patsnap's sales team
+    Searches for funding, acquisitions, leadership changes, product launches, etc.
+    All trigger (and region) queries are sent concurrently.
+
+    Args:
+        days_back: Number of days to look back
+        sort_by: Sort order (publishedAt recommended for timely triggers)
+        region: Optional region filter (e.g., 'Singapore', 'Asia', 'United States'),
+            or a list of regions to query each trigger for
+        trigger_queries: Optional dict of trigger name -> query
+            (defaults to SALES_TRIGGER_QUERIES)
+        max_workers: Maximum number of requests in flight at once
+        progress_callback: Optional callable(completed, total) for progress reporting
+        incremental: Only request articles newer than the latest publishedAt seen
+            for each trigger and region on previous fetches
+        multi_region: With several regions, send one region-agnostic query per
+            trigger and assign regions locally (see stream_multi_region)
+            instead of one query per trigger x region
+        fetch_state: Optional high-water marks from load_fetch_state, advanced
+            in place; save them with save_fetch_state once the articles are
+            stored (marks advanced without it are not saved)
+
+    When the daily request budget can't cover every query that isn't already
+    cached, the queries that produced the most new articles recently are sent
+    first and the rest are listed under "skippedQueries".
+
+    Returns:
+        dict: Combined news data with the unique articles from all sales trigger
+            queries; totalResults is the sum of NewsAPI's totals per query
+    """
+    duplicate_links = {}
+    stats = {"totalResults": 0}
+    articles, skipped_queries = stream_sales_triggers(
+        days_back=days_back,
+        sort_by=sort_by,
+        region=region,
+        trigger_queries=trigger_queries,
+        max_workers=max_workers,
+        progress_callback=progress_callback,
+        incremental=incremental,
+        duplicate_links=duplicate_links,
+        multi_region=multi_region,
+        stats=stats,
+        fetch_state=fetch_state,
+    )
+    with metrics.span("fetch.sales_triggers"):
+        unique_articles = list(articles)
+
+    # Link each dropped syndicated copy to the canonical article that was kept
+    by_url = {article["url"]: article for article in unique_articles}
+    for duplicate_url, canonical_url in duplicate_links.items():
+        by_url[canonical_url].setdefault("duplicate_urls", []).append(duplicate_url)
 
     return {
         "status": "ok",
-        "totalResults": len(unique_articles),
+        "totalResults": stats["totalResults"],
         "articles": unique_articles,
+        "skippedQueries": skipped_queries,
     }
 
 
 def save_news_to_file(news_data, filename="news_data.json"):
-    """Save news data to a JSON file in the data directory"""
+    """
+    Save news data to a JSON file in the data directory
+    The file is written to a temporary file and renamed into place, so sessions
+    saving at the same time never leave a half-written or interleaved file.
+    """
     if news_data:
-        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-        os.makedirs(data_dir, exist_ok=True)
-
-        filepath = os.path.join(data_dir, filename)
-        with open(filepath, "w") as f:
-            json.dump(news_data, f, indent=2)
+        filepath = os.path.join(DATA_DIR, filename)
+        write_json_atomic(filepath, news_data, indent=2)
         print(f"News data saved to {filepath}")
         return filepath
     return None
@@ -146,25 +711,38 @@ if __name__ == "__main__":
     print("Fetching sales trigger news for Patsnap (Singapore focus)...")
     print("=" * 50)
 
-    # Fetch sales triggers for Singapore
-    news = fetch_sales_triggers(days_back=7, sort_by="publishedAt", region="Singapore")
-
-    if news:
-        print(f"\nStatus: {news.get('status')}")
-        print(f"Total Unique Articles: {news.get('totalResults')}")
-        print(f"Articles Retrieved: {len(news.get('articles', []))}")
-
-        # Save to file
-        save_news_to_file(news, filename="sales_triggers.json")
-
-        # Print first 3 articles as examples
-        if news.get("articles"):
-            print("\n" + "=" * 50)
-            print("Sample Sales Trigger Articles:")
-            print("=" * 50)
-            for i, article in enumerate(news["articles"][:3], 1):
-                print(f"\n{i}. {article.get('title')}")
-                print(f"   Source: {article.get('source', {}).get('name')}")
-                print(f"   Published: {article.get('publishedAt')}")
-                print(f"   Trigger Type: {article.get('trigger_type')}")
-                print(f"   URL: {article.get('url')}")
+    # Stream sales triggers for Singapore into a JSON Lines log and the store,
+    # writing each batch as soon as it arrives
+    fetch_state = load_fetch_state()
+    duplicate_links = {}
+    articles, skipped_queries = stream_sales_triggers(
+        days_back=7,
+        sort_by="publishedAt",
+        region="Singapore",
+        incremental=True,
+        duplicate_links=duplicate_links,
+        fetch_state=fetch_state,
+    )
+    store = ArticleStore()
+    written, added = store_sink(
+        pipeline(
+            articles,
+            partial(write_jsonl, path=os.path.join(DATA_DIR, "sales_triggers.jsonl")),
+        ),
+        store,
+    )
+    # Only advance the high-water marks once the articles are stored
+    save_fetch_state(fetch_state)
+    store.record_trigger_queries(query_hashes(SALES_TRIGGER_QUERIES))
+    # Link the dropped syndicated copies to the canonical articles kept
+    store.link_duplicates(duplicate_links)
+
+    # Columnar snapshot for the dashboard
+    from src.snapshot import write_snapshot
+
+    write_snapshot(store)
+
+    print(f"\nArticles Retrieved: {written}")
+    print(f"Stored {added} new articles")
+    if skipped_queries:
+        print(f"Skipped {len(skipped_queries)} queries (request budget)")
@@ -0,0 +1,162 @@
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+from functools import partial
+
+from src.entities import update_company_index
+from src.get_news import (
+    SALES_TRIGGER_QUERIES,
+    load_fetch_state,
+    request_budget,
+    save_fetch_state,
+    stream_sales_triggers,
+)
+from src.matcher import query_hashes
+from src.pipeline import pipeline, score_and_filter, store_sink
+from src.store import ArticleStore
+from src.watchlist import collect_watchlist_alerts, update_watchlist_index
+
+# Defaults for the ingestion service, overridable from the environment
+INGEST_INTERVAL_MINUTES = int(os.getenv("INGEST_INTERVAL_MINUTES", "60"))
+INGEST_DAYS_BACK = int(os.getenv("INGEST_DAYS_BACK", "7"))
+INGEST_REGIONS = [
+    r.strip() for r in os.getenv("INGEST_REGIONS", "Singapore").split(",") if r.strip()
+]
+INGEST_MIN_RELEVANCE = float(os.getenv("INGEST_MIN_RELEVANCE", "0"))
+
+
+def run_ingestion(
+    store,
+    days_back=INGEST_DAYS_BACK,
+    regions=INGEST_REGIONS,
+    min_relevance=INGEST_MIN_RELEVANCE,
+):
+    """
+    Fetch new sales trigger articles and write them into the article store
+    Fetches are incremental and streamed: articles are upserted in batches as
+    the responses arrive, each batch in a single transaction, so readers never
+    see a half-written batch and memory stays flat on large multi-region runs.
+
+    Args:
+        store: ArticleStore to write into
+        days_back: Number of days to look back
+        regions: Regions to query each trigger for (empty for global)
+        min_relevance: Articles scoring below this (0-100) are not stored
+
+    Returns:
+        dict: Summary with fetched, added and skipped counts, and the new
+            watchlist alerts
+    """
+    duplicate_links = {}
+    fetch_state = load_fetch_state()
+    articles, skipped_queries = stream_sales_triggers(
+        days_back=days_back,
+        sort_by="publishedAt",
+        region=regions or None,
+        incremental=True,
+        duplicate_links=duplicate_links,
+        fetch_state=fetch_state,
+    )
+    scored = pipeline(
+        articles,
+        partial(
+            score_and_filter,
+            trigger_queries=SALES_TRIGGER_QUERIES,
+            min_relevance=min_relevance,
+        ),
+    )
+    fetched, added = store_sink(scored, store)
+    # Only advance the high-water marks once the articles are stored
+    save_fetch_state(fetch_state)
+    store.record_trigger_queries(query_hashes(SALES_TRIGGER_QUERIES))
+    store.link_duplicates(duplicate_links)
+    update_company_index(store)
+    update_watchlist_index(store)
+    alerts = collect_watchlist_alerts(store)
+    store.set_meta("last_ingested_at", datetime.now(timezone.utc).isoformat())
+
+    # Imported here so the service starts without loading pandas and pyarrow
+    from src.snapshot import write_snapshot
+
+    write_snapshot(store)
+    return {
+        "fetched": fetched,
+        "added": added,
+        "skipped": len(skipped_queries),
+        "alerts": alerts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fetch sales trigger news on a schedule into the article store"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=INGEST_INTERVAL_MINUTES,
+        help="Minutes between fetches",
+    )
+    parser.add_argument(
+        "--days-back", type=int, default=INGEST_DAYS_BACK, help="Days to look back"
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        dest="regions",
+        help="Region to query (repeatable, defaults to INGEST_REGIONS)",
+    )
+    parser.add_argument(
+        "--min-relevance",
+        type=float,
+        default=INGEST_MIN_RELEVANCE,
+        help="Don't store articles scoring below this relevance (0-100)",
+    )
+    parser.add_argument("--once", action="store_true", help="Fetch once and exit")
+    args = parser.parse_args()
+
+    store = ArticleStore()
+    regions = args.regions or INGEST_REGIONS
+    print(f"Ingesting sales triggers for {', '.join(regions) or 'Global'}")
+
+    try:
+        while True:
+            started = time.time()
+            try:
+                summary = run_ingestion(
+                    store,
+                    days_back=args.days_back,
+                    regions=regions,
+                    min_relevance=args.min_relevance,
+                )
+                print(
+                    f"[{datetime.now():%Y-%m-%d %H:%M:%S}] "
+                    f"Fetched {summary['fetched']}, stored {summary['added']} new, "
+                    f"skipped {summary['skipped']} queries "
+                    f"({request_budget.remaining()} requests left today)"
+                )
+                for alert in summary["alerts"]:
+                    owner = f" [{alert['owner']}]" if alert["owner"] else ""
+                    print(
+                        f"  Watchlist: {alert['account']}{owner} - "
+                        f"{alert['title']} ({alert['source_name']}) {alert['url']}"
+                    )
+            except Exception as e:
+                print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] Ingestion failed: {e}")
+
+            if args.once:
+                break
+
+            # Never wake up before a rate limit back-off has passed
+            delay = max(
+                args.interval * 60 - (time.time() - started),
+                request_budget.backoff_remaining(),
+            )
+            time.sleep(max(0, delay))
+    except KeyboardInterrupt:
+        print("Stopping ingestion")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import hashlib
+from collections import deque
+
+from src.query import parse, tokenize
+
+# Article fields searched by NewsAPI, matched separately so phrases can't span them
+MATCH_FIELDS = ["title", "description", "content"]
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher over word sequences
+    Patterns are tuples of lowercase words; the automaton walks a token stream
+    once and reports every pattern that occurs in it, whatever the number of
+    patterns.
+
+    Args:
+        patterns: Iterable of word tuples; pattern ids are their positions
+    """
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [set()]
+        self.alphabet = set()
+
+        for pattern_id, words in enumerate(patterns):
+            state = 0
+            for word in words:
+                self.alphabet.add(word)
+                if word not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append(set())
+                    self.goto[state][word] = len(self.goto) - 1
+                state = self.goto[state][word]
+            self.outputs[state].add(pattern_id)
+
+        # Breadth-first pass to build failure links and merge their outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(word, 0)
+                self.outputs[child] |= self.outputs[self.fail[child]]
+
+    def find(self, words, found=None):
+        """
+        Add the id of every pattern occurring in a word sequence to found
+
+        Returns:
+            set: The found pattern ids
+        """
+        found = set() if found is None else found
+        goto, fail = self.goto, self.fail
+        outputs, alphabet = self.outputs, self.alphabet
+        state = 0
+        for word in words:
+            if word not in alphabet:
+                state = 0
+                continue
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class QueryMatcher:
+    """
+    NewsAPI boolean queries compiled for offline matching
+    Every term and phrase of every query goes into one AhoCorasick automaton;
+    each query becomes a boolean function over the set of matched patterns.
+    Matching an article is one pass over its words plus a cheap tree evaluation
+    per query.
+
+    Args:
+        queries: Dict of name -> NewsAPI query string, in priority order
+
+    Raises:
+        QuerySyntaxError: If a query is malformed
+    """
+
+    def __init__(self, queries):
+        self.names = list(queries)
+        self._pattern_ids = {}
+        self._predicates = [self._compile(parse(q)) for q in queries.values()]
+        self.automaton = AhoCorasick(self._pattern_ids)
+
+    def _pattern(self, words):
+        return self._pattern_ids.setdefault(words, len(self._pattern_ids))
+
+    def _compile(self, node):
+        kind = node[0]
+        if kind in ("term", "phrase"):
+            pattern_id = self._pattern((node[1],) if kind == "term" else node[1])
+            return lambda found: pattern_id in found
+        if kind == "not":
+            child = self._compile(node[1])
+            return lambda found: not child(found)
+        children = [self._compile(c) for c in node[1]]
+        if kind == "and":
+            return lambda found: all(child(found) for child in children)
+        return lambda found: any(child(found) for child in children)
+
+    def found_patterns(self, article):
+        """Ids of all patterns occurring in the article's searchable fields"""
+        found = set()
+        for field in MATCH_FIELDS:
+            self.automaton.find(tokenize(article.get(field)), found)
+        return found
+
+    def matches(self, article):
+        """Names of all queries the article matches, in priority order"""
+        found = self.found_patterns(article)
+        return [
+            name
+            for name, predicate in zip(self.names, self._predicates)
+            if predicate(found)
+        ]
+
+    def classify(self, article):
+        """Name of the first query the article matches, or None"""
+        found = self.found_patterns(article)
+        for name, predicate in zip(self.names, self._predicates):
+            if predicate(found):
+                return name
+        return None
+
+
+def classify_articles(articles, queries, kept_triggers=()):
+    """
+    Re-apply trigger queries to stored articles without any API calls
+    Stored text is truncated, so triggers in kept_triggers are not re-matched:
+    an article keeps such a stored tag, and only the other queries are applied.
+
+    Args:
+        articles: Article dicts with title/description/content (and
+            trigger_type when kept_triggers is given)
+        queries: Dict of trigger name -> NewsAPI query string, in priority order
+        kept_triggers: Names whose query is unchanged since the stored tags
+            were assigned
+
+    Returns:
+        list: The first matching trigger name (or None) for each article
+    """
+    if not kept_triggers:
+        matcher = QueryMatcher(queries)
+        return [matcher.classify(article) for article in articles]
+    edited = {n: q for n, q in queries.items() if n not in kept_triggers}
+    matcher = QueryMatcher(edited) if edited else None
+    labels = []
+    for article in articles:
+        matched = set(matcher.matches(article)) if matcher else set()
+        stored = article.get("trigger_type")
+        labels.append(
+            next(
+                (
+                    name
+                    for name in queries
+                    if name in matched or (name in kept_triggers and name == stored)
+                ),
+                None,
+            )
+        )
+    return labels
+
+
+def query_hashes(queries):
+    """
+    Short hash of each query's text, recorded with the tags it produced so
+    later runs can tell which stored tags an edited query may have invalidated
+
+    Args:
+        queries: Dict of name -> NewsAPI query string
+
+    Returns:
+        dict: Name -> hash of its query text
+    """
+    return {
+        name: hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+        for name, query in queries.items()
+    }
@@ -0,0 +1,142 @@
+import functools
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Print every span and error as a JSON line when set
+METRICS_LOG = os.getenv("NEWS_METRICS_LOG", "").lower() in ("1", "true", "yes")
+
+# Prefix of every metric name in the Prometheus text output
+PROMETHEUS_PREFIX = "news"
+
+
+class Metrics:
+    """
+    Process-wide timing spans and counters
+    Spans record how often and how long a code path ran (count, total, max and
+    last duration); counters add up events such as requests or cache hits.
+    Safe to use from the fetch worker threads and every dashboard session.
+    """
+
+    def __init__(self, log=METRICS_LOG):
+        self.log = log
+        self.spans = {}
+        self.counters = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def _emit(self, event, **fields):
+        if self.log:
+            record = {"ts": datetime.now(timezone.utc).isoformat(), "event": event}
+            print(json.dumps({**record, **fields}, default=str), flush=True)
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Time the enclosed block under name; extra fields go to the log line"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, **fields)
+
+    def timed(self, name):
+        """Decorator timing every call of a function under name"""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name, seconds, **fields):
+        """Add one timed run of name"""
+        with self._lock:
+            stats = self.spans.setdefault(
+                name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0}
+            )
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["last"] = seconds
+        self._emit("span", name=name, seconds=round(seconds, 6), **fields)
+
+    def increment(self, name, value=1):
+        """Add value to the counter name"""
+        if not value:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def error(self, name, error):
+        """Count a failure under name.errors and log it"""
+        self.increment(f"{name}.errors")
+        self._emit("error", name=name, error=str(error))
+
+    def snapshot(self):
+        """
+        Copy of the current spans and counters
+
+        Returns:
+            dict: spans (name -> count/total/max/last seconds and mean),
+                counters (name -> value) and uptime in seconds
+        """
+        with self._lock:
+            spans = {
+                name: {**stats, "mean": stats["total"] / stats["count"]}
+                for name, stats in self.spans.items()
+            }
+            counters = dict(self.counters)
+        return {
+            "spans": spans,
+            "counters": counters,
+            "uptime": time.time() - self.started_at,
+        }
+
+    def reset(self):
+        """Forget every span and counter"""
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+            self.started_at = time.time()
+
+    def to_prometheus(self, prefix=PROMETHEUS_PREFIX):
+        """Current spans and counters in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_span_seconds Time spent in instrumented code paths",
+            f"# TYPE {prefix}_span_seconds summary",
+        ]
+        for name, stats in sorted(snapshot["spans"].items()):
+            label = f'{{span="{_escape(name)}"}}'
+            lines.append(f"{prefix}_span_seconds_count{label} {stats['count']}")
+            lines.append(f"{prefix}_span_seconds_sum{label} {stats['total']:.6f}")
+        lines += [
+            f"# HELP {prefix}_span_seconds_max Longest run of each code path",
+            f"# TYPE {prefix}_span_seconds_max gauge",
+        ]
+        for name, stats in sorted(snapshot["spans"].items()):
+            label = f'{{span="{_escape(name)}"}}'
+            lines.append(f"{prefix}_span_seconds_max{label} {stats['max']:.6f}")
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        lines.append(f"# TYPE {prefix}_uptime_seconds gauge")
+        lines.append(f"{prefix}_uptime_seconds {snapshot['uptime']:.0f}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared instance used by the fetch, store and dashboard code
+metrics = Metrics()
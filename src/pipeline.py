@@ -0,0 +1,148 @@
+import json
+import os
+from datetime import datetime, timezone
+from itertools import islice
+
+from src.dedup import SIMILARITY_THRESHOLD, LSHIndex, MinHasher, article_text
+from src.metrics import metrics
+
+# Articles handed to vectorized stages and store writes at a time
+BATCH_SIZE = 200
+
+
+def pipeline(source, *stages):
+    """
+    Chain generator stages over an article stream
+    Each stage is a callable taking an iterable of articles and returning an
+    iterable of articles; use functools.partial to bind stage options.
+    Nothing runs until the result is consumed, e.g. by a sink.
+
+    Args:
+        source: Iterable of articles
+        stages: Stages applied in order
+
+    Returns:
+        iterator: The articles coming out of the last stage
+    """
+    stream = iter(source)
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+
+def batched(items, size=BATCH_SIZE):
+    """Yield lists of up to size items from an iterable"""
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def drop_duplicate_urls(articles, seen_urls=None):
+    """
+    Pass each URL through once (keeps only the set of seen URLs in memory)
+
+    Args:
+        articles: Iterable of articles
+        seen_urls: Optional set shared with other streams, updated in place
+    """
+    seen_urls = set() if seen_urls is None else seen_urls
+    for article in articles:
+        url = article.get("url")
+        if url and url not in seen_urls:
+            seen_urls.add(url)
+            yield article
+        else:
+            metrics.increment("articles.duplicate_urls")
+
+
+def drop_near_duplicates(articles, threshold=SIMILARITY_THRESHOLD, links=None):
+    """
+    Pass only the first article of each near-duplicate cluster
+    Only MinHash signatures are kept in memory, not the articles themselves.
+
+    Args:
+        articles: Iterable of articles
+        threshold: Estimated Jaccard similarity for near-duplicates
+        links: Optional dict filled with dropped URL -> canonical URL
+    """
+    hasher = MinHasher()
+    index = LSHIndex(threshold)
+    for article in articles:
+        signature = hasher.signature(article_text(article))
+        if signature is None:
+            metrics.increment("articles.kept")
+            yield article
+            continue
+        canonical_url = index.query(signature)
+        if canonical_url is None:
+            index.add(article.get("url"), signature)
+            metrics.increment("articles.kept")
+            yield article
+            continue
+        metrics.increment("articles.near_duplicates")
+        if links is not None:
+            links[article.get("url")] = canonical_url
+
+
+def score_and_filter(
+    articles,
+    trigger_queries=None,
+    default_query=None,
+    min_relevance=0,
+    batch_size=BATCH_SIZE,
+):
+    """
+    Add a relevance score to each article and drop those below min_relevance
+    Articles are scored in batches so the vectorized scoring still applies.
+    """
+    # pandas is only loaded once there is something to score
+    from src.analytics import prepare_articles_frame
+    from src.scoring import score_articles
+
+    for batch in batched(articles, batch_size):
+        scored = score_articles(
+            prepare_articles_frame(batch),
+            trigger_queries=trigger_queries,
+            default_query=default_query,
+            now=datetime.now(timezone.utc),
+        )
+        for article, relevance in zip(batch, scored["relevance"]):
+            if relevance >= min_relevance:
+                article["relevance"] = float(relevance)
+                yield article
+            else:
+                metrics.increment("articles.below_relevance")
+
+
+def write_jsonl(articles, path):
+    """
+    Append each article to a JSON Lines file as it passes through
+
+    Args:
+        articles: Iterable of articles
+        path: Output file, created (with its directory) if missing
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a") as f:
+        for article in articles:
+            f.write(json.dumps(article) + "\n")
+            yield article
+
+
+def store_sink(articles, store, batch_size=BATCH_SIZE):
+    """
+    Upsert an article stream into the article store, one transaction per batch
+
+    Returns:
+        tuple: (articles written, articles not stored before)
+    """
+    written = added = 0
+    for batch in batched(articles, batch_size):
+        added += store.upsert_articles(batch)
+        written += len(batch)
+    return written, added
+
+
+def drain(articles):
+    """Consume a stream for its side effects, returning the number of articles"""
+    return sum(1 for _ in articles)
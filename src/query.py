@@ -0,0 +1,150 @@
+import re
+
+# Words are lowercase runs of letters and digits, for both articles and queries
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"?|([+-]?[^\s()"]+))')
+
+OPERATORS = {"AND", "OR", "NOT"}
+
+
+class QuerySyntaxError(ValueError):
+    """Raised when a search query can't be parsed"""
+
+
+def tokenize(text):
+    """Split text into lowercase words"""
+    return WORD_RE.findall((text or "").lower())
+
+
+def _lex(query):
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_RE.match(query, position)
+        if not match or match.end() == position:
+            raise QuerySyntaxError(f"Unexpected character at {position}: {query!r}")
+        position = match.end()
+        open_paren, close_paren, phrase, word = match.groups()
+        if open_paren:
+            tokens.append(("(", None))
+        elif close_paren:
+            tokens.append((")", None))
+        elif phrase is not None:
+            tokens.append(("phrase", phrase))
+        elif word in OPERATORS:
+            tokens.append((word, None))
+        else:
+            tokens.append(("word", word))
+    return tokens
+
+
+def _leaf(text):
+    words = tuple(tokenize(text))
+    if not words:
+        return None
+    if len(words) == 1:
+        return ("term", words[0])
+    return ("phrase", words)
+
+
+class _Parser:
+    """
+    Recursive descent parser, precedence NOT > AND > OR.
+    Adjacent terms are joined with AND, so "a NOT b" means a AND NOT b.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def next(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self.peek()!r} in query")
+        return node
+
+    def parse_or(self):
+        children = [self.parse_and()]
+        while self.peek() == "OR":
+            self.next()
+            children.append(self.parse_and())
+        return _combine("or", children)
+
+    def parse_and(self):
+        children = [self.parse_unary()]
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.next()
+            children.append(self.parse_unary())
+        return _combine("and", children)
+
+    def parse_unary(self):
+        kind = self.peek()
+        if kind == "NOT":
+            self.next()
+            return ("not", self.parse_unary())
+        if kind == "(":
+            self.next()
+            node = self.parse_or()
+            if self.peek() != ")":
+                raise QuerySyntaxError("Missing closing parenthesis")
+            self.next()
+            return node
+        if kind in ("word", "phrase"):
+            _, text = self.next()
+            negate = False
+            if kind == "word" and text[0] in "+-":
+                negate = text[0] == "-"
+                text = text[1:]
+            node = _leaf(text)
+            if node is None:
+                return ("and", [])
+            return ("not", node) if negate else node
+        raise QuerySyntaxError(f"Expected a term, got {kind!r}")
+
+
+def _combine(operator, children):
+    children = [c for c in children if c != ("and", [])]
+    if len(children) == 1:
+        return children[0]
+    return (operator, children)
+
+
+def parse(query):
+    """
+    Parse a NewsAPI-style boolean query into a tree of tuples:
+    ("term", word), ("phrase", (word, ...)), ("and", [nodes]), ("or", [nodes])
+    and ("not", node). Supports AND/OR/NOT, parentheses, "exact phrases",
+    +required and -excluded words.
+
+    Raises:
+        QuerySyntaxError: If the query is malformed
+    """
+    tokens = _lex(query)
+    if not tokens:
+        raise QuerySyntaxError("Empty query")
+    return _Parser(tokens).parse()
+
+
+def positive_terms(node):
+    """Words that count towards ranking: every term and phrase word not under NOT"""
+    kind = node[0]
+    if kind == "term":
+        return [node[1]]
+    if kind == "phrase":
+        return list(node[1])
+    if kind == "not":
+        return []
+    return [word for child in node[1] for word in positive_terms(child)]
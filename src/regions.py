@@ -0,0 +1,151 @@
+from src.matcher import MATCH_FIELDS, AhoCorasick
+from src.query import tokenize
+
+# Place names, demonyms and market names that tie an article to a region
+REGION_TERMS = {
+    "Singapore": ["singapore", "singaporean", "sgx", "jurong", "changi", "temasek"],
+    "China": [
+        "china",
+        "chinese",
+        "prc",
+        "beijing",
+        "shanghai",
+        "shenzhen",
+        "guangzhou",
+        "hangzhou",
+        "hong kong",
+    ],
+    "India": [
+        "india",
+        "indian",
+        "mumbai",
+        "delhi",
+        "bengaluru",
+        "bangalore",
+        "hyderabad",
+        "chennai",
+        "pune",
+        "sensex",
+        "nifty",
+    ],
+    "Japan": ["japan", "japanese", "tokyo", "osaka", "yokohama", "kyoto", "nikkei"],
+    "United States": [
+        "united states",
+        "u s",
+        "usa",
+        "america",
+        "american",
+        "new york",
+        "california",
+        "silicon valley",
+        "san francisco",
+        "texas",
+        "boston",
+        "nasdaq",
+        "nyse",
+    ],
+    "Europe": [
+        "europe",
+        "european",
+        "eu",
+        "united kingdom",
+        "uk",
+        "britain",
+        "british",
+        "london",
+        "germany",
+        "german",
+        "berlin",
+        "france",
+        "french",
+        "paris",
+        "netherlands",
+        "amsterdam",
+        "switzerland",
+        "zurich",
+        "spain",
+        "italy",
+        "sweden",
+        "ireland",
+        "dublin",
+    ],
+    "Asia": [
+        "asia",
+        "asian",
+        "apac",
+        "asia pacific",
+        "asean",
+        "malaysia",
+        "indonesia",
+        "thailand",
+        "vietnam",
+        "philippines",
+        "korea",
+        "seoul",
+        "taiwan",
+        "jakarta",
+        "kuala lumpur",
+        "bangkok",
+        "manila",
+    ],
+}
+
+# Regions that also count for a wider region
+REGION_PARENTS = {
+    "Singapore": "Asia",
+    "China": "Asia",
+    "India": "Asia",
+    "Japan": "Asia",
+}
+
+
+class RegionTagger:
+    """
+    Local region assignment from a place-name gazetteer
+    All region terms go into one AhoCorasick automaton, so tagging an article
+    is a single pass over its words whatever the number of regions.
+
+    Args:
+        region_terms: Dict of region -> list of lowercase terms
+        region_parents: Dict of region -> wider region it also counts for
+    """
+
+    def __init__(self, region_terms=REGION_TERMS, region_parents=REGION_PARENTS):
+        self.parents = region_parents
+        self._pattern_regions = []
+        patterns = []
+        for region, terms in region_terms.items():
+            for term in terms:
+                patterns.append(tuple(tokenize(term)))
+                self._pattern_regions.append(region)
+        self.automaton = AhoCorasick(patterns)
+
+    def regions(self, article):
+        """Set of regions an article's title, description or content mention"""
+        found = set()
+        for field in MATCH_FIELDS:
+            self.automaton.find(tokenize(article.get(field)), found)
+        regions = {self._pattern_regions[i] for i in found}
+        return regions | {self.parents[r] for r in regions if r in self.parents}
+
+
+def tag_regions(articles, regions, tagger=None):
+    """
+    Pipeline stage: tag articles with the requested regions they mention
+    Sets article["regions"] and drops articles that mention none of them.
+    A region the article was explicitly queried for always counts.
+
+    Args:
+        articles: Iterable of articles
+        regions: Requested region names
+        tagger: Optional RegionTagger
+    """
+    tagger = tagger or RegionTagger()
+    requested = set(regions)
+    for article in articles:
+        matched = tagger.regions(article) & requested
+        if article.get("region"):
+            matched.add(article["region"])
+        if matched:
+            article["regions"] = sorted(matched)
+            yield article
@@ -0,0 +1,241 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src.dedup import (
+    BAND_ROWS,
+    NUM_PERMUTATIONS,
+    SHINGLE_SIZE,
+    SIMILARITY_THRESHOLD,
+    MinHasher,
+    article_text,
+)
+from src.entities import update_company_index
+from src.matcher import QueryMatcher, query_hashes
+from src.store import ArticleStore
+from src.triggers import SALES_TRIGGER_QUERIES
+from src.watchlist import update_watchlist_index
+
+# Bumped when the re-processing rules change, so the next run starts over
+REPROCESS_VERSION = 1
+
+# Articles per chunk: one unit of work for a worker and one store transaction
+CHUNK_SIZE = 1000
+
+# Chunks read ahead per worker, bounding memory on large archives
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Per-worker state, built once by _init_worker
+_matcher = None
+_hasher = None
+_kept_triggers = set()
+
+
+def job_version(trigger_queries, dedup=True):
+    """
+    Identifies the rules a re-processing run applies
+    A checkpoint is only resumed by a run with the same trigger queries and
+    dedup settings; changing either re-processes the whole archive.
+    """
+    settings = [
+        REPROCESS_VERSION,
+        list(trigger_queries.items()),
+        dedup and [SHINGLE_SIZE, NUM_PERMUTATIONS, BAND_ROWS, SIMILARITY_THRESHOLD],
+    ]
+    digest = hashlib.sha1(json.dumps(settings).encode("utf-8"))
+    return f"{REPROCESS_VERSION}:{digest.hexdigest()[:8]}"
+
+
+def _init_worker(trigger_queries, kept_triggers):
+    global _matcher, _hasher, _kept_triggers
+    _matcher = QueryMatcher(trigger_queries)
+    _hasher = MinHasher()
+    _kept_triggers = kept_triggers
+
+
+def process_chunk(articles):
+    """
+    Re-derive the trigger tags and near-duplicate signature of each article
+    Runs in a worker process; pure computation, the parent does the writes.
+
+    Args:
+        articles: Dicts from ArticleStore.query_article_chunk
+
+    Returns:
+        list: Dicts with id, trigger_type (first matching trigger, or the
+            stored one if nothing matches and that trigger's query is
+            unchanged), triggers and signature, in the same order
+    """
+    results = []
+    for article in articles:
+        triggers = _matcher.matches(article)
+        trigger_type = triggers[0] if triggers else None
+        # The stored text is truncated: keep NewsAPI's tag while the query that
+        # produced it hasn't been edited
+        if trigger_type is None and article["trigger_type"] in _kept_triggers:
+            trigger_type = article["trigger_type"]
+            triggers = [trigger_type]
+        results.append(
+            {
+                "id": article["id"],
+                "trigger_type": trigger_type,
+                "triggers": triggers,
+                "signature": _hasher.signature(article_text(article)),
+            }
+        )
+    return results
+
+
+def iter_chunks(store, after_id, chunk_size=CHUNK_SIZE):
+    """Stream the stored articles after after_id in storage order, chunk by chunk"""
+    while True:
+        chunk = store.query_article_chunk(after_id=after_id, limit=chunk_size)
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1]["id"]
+
+
+def reprocess_archive(
+    store,
+    trigger_queries=None,
+    workers=None,
+    chunk_size=CHUNK_SIZE,
+    dedup=True,
+    restart=False,
+    progress_callback=None,
+):
+    """
+    Re-tag and re-deduplicate every stored article with the current rules
+    Chunks are streamed from the store and fanned out over a process pool;
+    results are written back in storage order, one transaction per chunk,
+    together with a checkpoint. An interrupted run resumes after the last
+    written chunk, and a finished one only processes articles stored since.
+
+    Args:
+        store: ArticleStore to re-process
+        trigger_queries: Dict of trigger name -> NewsAPI query string, in
+            priority order (defaults to SALES_TRIGGER_QUERIES)
+        workers: Worker processes (defaults to the number of CPUs)
+        chunk_size: Articles per chunk
+        dedup: Collapse stored near-duplicates into the earliest copy
+        restart: Ignore the checkpoint and start from the first article
+        progress_callback: Optional callable(processed, total, summary)
+
+    Returns:
+        dict: Summary with processed, retagged and merged counts
+    """
+    trigger_queries = trigger_queries or SALES_TRIGGER_QUERIES
+    workers = workers or os.cpu_count() or 1
+    version = job_version(trigger_queries, dedup)
+    if restart or store.get_meta("reprocess_version") != version:
+        store.set_meta("reprocess_version", version)
+        store.set_meta("reprocess_last_article_id", 0)
+    after_id = int(store.get_meta("reprocess_last_article_id", 0))
+
+    # Unmatched articles only keep their tag when its query text is the one the
+    # stored tags were derived with; stores from before the hashes were recorded
+    # were tagged with the built-in queries
+    hashes = query_hashes(trigger_queries)
+    recorded = store.trigger_query_hashes() or query_hashes(SALES_TRIGGER_QUERIES)
+    kept_triggers = {name for name, h in hashes.items() if recorded.get(name) == h}
+
+    total = store.count()
+    summary = {"processed": 0, "retagged": 0, "merged": 0}
+    chunks = iter_chunks(store, after_id, chunk_size)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(trigger_queries, kept_triggers),
+    ) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(
+                (chunk[-1]["id"], len(chunk), executor.submit(process_chunk, chunk))
+            )
+            if len(pending) < workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                continue
+            _write_next(store, pending, summary, dedup)
+            if progress_callback:
+                progress_callback(summary["processed"], total, summary)
+        while pending:
+            _write_next(store, pending, summary, dedup)
+            if progress_callback:
+                progress_callback(summary["processed"], total, summary)
+
+    store.record_trigger_queries(hashes)
+    if summary["processed"]:
+        store.rebuild_rollup()
+        if summary["merged"]:
+            # Merged articles took their company and watchlist tags along
+            update_company_index(store)
+            update_watchlist_index(store)
+    return summary
+
+
+def _write_next(store, pending, summary, dedup):
+    """Write the oldest pending chunk; chunks are written in storage order"""
+    last_article_id, size, future = pending.popleft()
+    counts = store.apply_reprocessed(future.result(), last_article_id, dedup=dedup)
+    summary["processed"] += size
+    summary["retagged"] += counts["retagged"]
+    summary["merged"] += counts["merged"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-tag and re-deduplicate every stored article with the "
+        "current trigger queries and dedup rules"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="Articles per chunk"
+    )
+    parser.add_argument(
+        "--no-dedup", action="store_true", help="Keep stored near-duplicates"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore the checkpoint and start over"
+    )
+    args = parser.parse_args()
+
+    store = ArticleStore()
+    started = time.time()
+
+    def report(processed, total, summary):
+        print(
+            f"Processed {processed}/{total} articles "
+            f"({summary['retagged']} retagged, {summary['merged']} merged)"
+        )
+
+    summary = reprocess_archive(
+        store,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        dedup=not args.no_dedup,
+        restart=args.restart,
+        progress_callback=report,
+    )
+    if not summary["processed"]:
+        print("Nothing to re-process; use --restart to re-process everything")
+        return
+
+    # Imported here so the job starts without loading pandas and pyarrow
+    from src.snapshot import write_snapshot
+
+    write_snapshot(store)
+    print(
+        f"Re-processed {summary['processed']} articles in "
+        f"{time.time() - started:.1f}s: {summary['retagged']} retagged, "
+        f"{summary['merged']} merged into near-duplicates"
+    )
+
+
+if __name__ == "__main__":
+    main()
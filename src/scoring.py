@@ -0,0 +1,172 @@
+import functools
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from src.metrics import metrics
+from src.query import QuerySyntaxError, parse, positive_terms
+
+# Reputation (0-1) of known news sources
+SOURCE_REPUTATION_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "config", "source_reputation.csv"
+)
+
+# Reputation of sources missing from the table
+DEFAULT_SOURCE_REPUTATION = 0.5
+
+# Share of query keywords among an article's words that counts as a full match
+TARGET_KEYWORD_DENSITY = 0.08
+
+# Hours after which the recency component has halved
+RECENCY_HALF_LIFE_HOURS = 72
+
+# Weights of the score components, summing to 1
+SCORE_WEIGHTS = {"source": 0.3, "keywords": 0.45, "recency": 0.25}
+
+# Factor applied to the score for each negative term hit, down to the floor
+NEGATIVE_TERM_PENALTY = 0.5
+NEGATIVE_TERM_FLOOR = 0.1
+
+# Terms that mark an off-target hit, for every trigger ("*") or one trigger
+NEGATIVE_TERMS = {
+    "*": ["market size", "cagr", "forecast period", "stock market", "horoscope"],
+    "Patent & IP": [
+        "journal",
+        "research",
+        "researchers",
+        "academic",
+        "university",
+        "study",
+        "heritage",
+        "plos",
+    ],
+    "Product Launch": ["review", "hands-on", "rumor", "rumour", "leak", "discount"],
+    "Expansion": ["market report", "market research", "industry analysis"],
+}
+
+# Default minimum score for articles shown in the dashboard
+DEFAULT_MIN_RELEVANCE = 20
+
+
+def load_source_reputation(path=SOURCE_REPUTATION_PATH):
+    """
+    Read the source reputation table
+    The table is memoized on the file's modification time, so scoring doesn't
+    re-read the CSV on every call but still picks up edits. The returned
+    Series is shared and must not be modified in place.
+
+    Returns:
+        Series: Reputation indexed by source name (empty if the file is missing)
+    """
+    modified_at = os.path.getmtime(path) if os.path.exists(path) else None
+    return _read_source_reputation(path, modified_at)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_source_reputation(path, modified_at):
+    if modified_at is None:
+        return pd.Series(dtype=float)
+    table = pd.read_csv(path)
+    return table.set_index("source")["reputation"].astype(float)
+
+
+def terms_pattern(terms):
+    """Whole-word regex matching any of the terms in lowercased text, or None"""
+    terms = sorted({t.lower() for t in terms if t}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile(r"\b(?:" + "|".join(re.escape(t) for t in terms) + r")\b")
+
+
+def query_keywords(query):
+    """Positive words of a NewsAPI query, or an empty list if it doesn't parse"""
+    try:
+        return positive_terms(parse(query))
+    except QuerySyntaxError:
+        return []
+
+
+@metrics.timed("scoring.score_articles")
+def score_articles(
+    df,
+    trigger_queries=None,
+    default_query=None,
+    source_reputation=None,
+    now=None,
+):
+    """
+    Relevance score (0-100) of every article, computed column-wise
+
+    The score blends source reputation, the density of query keywords in the
+    title and description, and an exponential recency decay, and is cut down
+    for each trigger-specific negative term found.
+
+    Args:
+        df: Frame from prepare_articles_frame (with title and description)
+        trigger_queries: Dict of trigger name -> NewsAPI query for tagged articles
+        default_query: Query whose keywords apply to untagged articles
+        source_reputation: Optional Series from load_source_reputation
+        now: Reference time for recency (defaults to the newest article)
+
+    Returns:
+        DataFrame: A copy of df with a float relevance column
+    """
+    if df.empty:
+        return df.assign(relevance=pd.Series(dtype=float))
+    if source_reputation is None:
+        source_reputation = load_source_reputation()
+
+    text = (df["title"].fillna("") + " " + df["description"].fillna("")).str.lower()
+    # Spaces are a close enough word count and much cheaper than a regex
+    word_counts = (text.str.count(" ") + 1).to_numpy()
+    triggers = (
+        df["trigger_type"].astype(object).to_numpy()
+        if "trigger_type" in df.columns
+        else np.full(len(df), None, dtype=object)
+    )
+
+    # Keyword hits and negative hits per trigger, one regex pass per column slice
+    keyword_hits = np.zeros(len(df))
+    negative_hits = np.zeros(len(df))
+    queries = dict(trigger_queries or {})
+    # Untagged rows (None or NaN, which never equals itself) form one group
+    missing = pd.isna(triggers)
+    groups = [(None, missing)] if missing.any() else []
+    groups += [(t, triggers == t) for t in pd.unique(triggers[~missing])]
+    for trigger, mask in groups:
+        query = (
+            default_query if trigger is None else queries.get(trigger, default_query)
+        )
+        keywords = terms_pattern(query_keywords(query) if query else [])
+        if keywords is not None:
+            keyword_hits[mask] = text[mask].str.count(keywords).to_numpy()
+        negatives = terms_pattern(
+            NEGATIVE_TERMS.get("*", []) + NEGATIVE_TERMS.get(trigger, [])
+        )
+        if negatives is not None:
+            negative_hits[mask] = text[mask].str.count(negatives).to_numpy()
+
+    source = (
+        df["source_name"]
+        .map(source_reputation)
+        .fillna(DEFAULT_SOURCE_REPUTATION)
+        .to_numpy()
+    )
+    keywords = np.clip(keyword_hits / word_counts / TARGET_KEYWORD_DENSITY, 0, 1)
+
+    published = df["publishedAt"]
+    reference = published.max() if now is None else pd.Timestamp(now)
+    if reference.tzinfo is None:
+        reference = reference.tz_localize("UTC")
+    age_hours = ((reference - published).dt.total_seconds() / 3600).clip(lower=0)
+    recency = np.exp2(-age_hours.to_numpy() / RECENCY_HALF_LIFE_HOURS)
+
+    score = (
+        SCORE_WEIGHTS["source"] * source
+        + SCORE_WEIGHTS["keywords"] * keywords
+        + SCORE_WEIGHTS["recency"] * recency
+    )
+    penalty = np.maximum(NEGATIVE_TERM_PENALTY**negative_hits, NEGATIVE_TERM_FLOOR)
+    return df.assign(relevance=np.round(100 * score * penalty, 1))
@@ -0,0 +1,164 @@
+import math
+import threading
+from collections import defaultdict
+
+from src.query import parse, positive_terms, tokenize
+
+# Fields indexed for each article, in order
+SEARCH_FIELDS = ["title", "description", "content"]
+
+# Position gap between fields so phrases can't match across them
+FIELD_GAP = 1000
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class InvertedIndex:
+    """
+    Positional inverted index over article titles, descriptions and content
+    Supports the NewsAPI query syntax (see src.query.parse) for matching and
+    ranks matches with BM25. Articles are added incrementally by key (URL);
+    keys that are already indexed are skipped.
+    """
+
+    def __init__(self):
+        # word -> {doc_id: [positions]}
+        self.postings = defaultdict(dict)
+        self.doc_keys = []
+        self.doc_lengths = []
+        self.doc_ids = {}
+        self.total_length = 0
+        self.last_article_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.doc_keys)
+
+    def add(self, key, article):
+        """Index one article dict under key, unless it is already indexed"""
+        if key in self.doc_ids:
+            return False
+
+        doc_id = len(self.doc_keys)
+        positions = defaultdict(list)
+        offset = 0
+        for field in SEARCH_FIELDS:
+            words = tokenize(article.get(field))
+            for i, word in enumerate(words):
+                positions[word].append(offset + i)
+            offset += len(words) + FIELD_GAP
+
+        for word, word_positions in positions.items():
+            self.postings[word][doc_id] = word_positions
+
+        length = sum(len(p) for p in positions.values())
+        self.doc_keys.append(key)
+        self.doc_lengths.append(length)
+        self.doc_ids[key] = doc_id
+        self.total_length += length
+        return True
+
+    def add_articles(self, articles, key_field="url"):
+        """
+        Index a batch of articles
+
+        Args:
+            articles: Article dicts; an "id" field, when present, is remembered
+                as last_article_id so callers can fetch only newer rows next time
+            key_field: Field used as the document key
+
+        Returns:
+            int: Number of newly indexed articles
+        """
+        added = 0
+        with self._lock:
+            for article in articles:
+                if self.add(article[key_field], article):
+                    added += 1
+                self.last_article_id = max(self.last_article_id, article.get("id") or 0)
+        return added
+
+    def _match(self, node):
+        kind = node[0]
+        if kind == "term":
+            return set(self.postings.get(node[1], ()))
+        if kind == "phrase":
+            return self._match_phrase(node[1])
+        if kind == "not":
+            return set(range(len(self.doc_keys))) - self._match(node[1])
+        if kind == "and":
+            if not node[1]:
+                return set(range(len(self.doc_keys)))
+            # Evaluate positive children first, smallest result first
+            positives = sorted(
+                (self._match(c) for c in node[1] if c[0] != "not"), key=len
+            )
+            negatives = [self._match(c[1]) for c in node[1] if c[0] == "not"]
+            result = (
+                positives[0].intersection(*positives[1:])
+                if positives
+                else set(range(len(self.doc_keys)))
+            )
+            for negative in negatives:
+                result -= negative
+            return result
+        if kind == "or":
+            return set().union(*(self._match(c) for c in node[1]))
+        raise ValueError(f"Unknown query node {kind!r}")
+
+    def _match_phrase(self, words):
+        postings = [self.postings.get(word, {}) for word in words]
+        candidates = set(postings[0]).intersection(*postings[1:])
+        matches = set()
+        for doc_id in candidates:
+            following = [set(p[doc_id]) for p in postings[1:]]
+            for start in postings[0][doc_id]:
+                if all(start + i + 1 in f for i, f in enumerate(following)):
+                    matches.add(doc_id)
+                    break
+        return matches
+
+    def _bm25(self, doc_ids, words):
+        scores = dict.fromkeys(doc_ids, 0.0)
+        if not scores:
+            return scores
+        n_docs = len(self.doc_keys)
+        avg_length = self.total_length / n_docs if self.total_length else 1
+        for word in set(words):
+            postings = self.postings.get(word)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id in doc_ids:
+                positions = postings.get(doc_id)
+                if not positions:
+                    continue
+                tf = len(positions)
+                norm = 1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / avg_length
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        return scores
+
+    def search(self, query, limit=None):
+        """
+        Find articles matching a NewsAPI-style query, best BM25 score first
+
+        Args:
+            query: Query string, e.g. 'patent AND (granted OR filed) NOT university'
+            limit: Maximum number of results
+
+        Returns:
+            list: (key, score) tuples
+
+        Raises:
+            QuerySyntaxError: If the query is malformed
+        """
+        node = parse(query)
+        with self._lock:
+            doc_ids = self._match(node)
+            scores = self._bm25(doc_ids, positive_terms(node))
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            if limit is not None:
+                ranked = ranked[:limit]
+            return [(self.doc_keys[doc_id], score) for doc_id, score in ranked]
@@ -0,0 +1,141 @@
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.files import atomic_write
+from src.metrics import metrics
+from src.store import DEFAULT_STORE_PATH, LIST_COLUMNS
+
+# Columnar snapshot of the article store, next to the database; the long
+# article bodies go to a separate file with the same row order
+SNAPSHOT_PATH = os.path.join(os.path.dirname(DEFAULT_STORE_PATH), "articles.arrow")
+CONTENT_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(DEFAULT_STORE_PATH), "articles_content.arrow"
+)
+
+# Columns with few distinct values, stored dictionary-encoded
+DICTIONARY_COLUMNS = ["source_name", "trigger_type", "regions"]
+
+
+def _write_table(table, path):
+    """Write an Arrow IPC file via a temporary file, so readers never see half of it"""
+    with atomic_write(path) as tmp_path:
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+
+def _read_table(path):
+    """Memory-map an Arrow IPC file; the mapping lives as long as the table"""
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def _store_version(table):
+    metadata = table.schema.metadata or {}
+    return int(metadata.get(b"store_version", -1))
+
+
+@metrics.timed("snapshot.write")
+def write_snapshot(store, path=SNAPSHOT_PATH, content_path=CONTENT_SNAPSHOT_PATH):
+    """
+    Write every stored article to the columnar snapshot the dashboard loads
+    Uncompressed Arrow IPC files can be memory-mapped and read column by
+    column. publishedAt is stored as a timestamp, so it isn't parsed on load.
+
+    Args:
+        store: ArticleStore to snapshot
+        path: Snapshot file for the list columns
+        content_path: Snapshot file for the article content
+
+    Returns:
+        int: Number of articles written
+    """
+    version = store.version()
+    frame = pd.DataFrame(
+        store.query_articles(columns=LIST_COLUMNS + ["content"]),
+        columns=LIST_COLUMNS + ["content"],
+    )
+    metadata = {
+        "store_version": str(version),
+        "written_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    columns = {}
+    for name in LIST_COLUMNS:
+        if name == "publishedAt":
+            array = pa.array(
+                pd.to_datetime(frame[name], utc=True, format="ISO8601"),
+                type=pa.timestamp("s", tz="UTC"),
+                safe=False,
+            )
+        else:
+            array = pa.array(frame[name], type=pa.string(), from_pandas=True)
+        if name in DICTIONARY_COLUMNS:
+            array = array.dictionary_encode()
+        columns[name] = array
+    content = pa.array(frame["content"], type=pa.string(), from_pandas=True)
+
+    # Content first: the list file's store version is what readers check
+    _write_table(pa.table({"content": content}, metadata=metadata), content_path)
+    _write_table(pa.table(columns, metadata=metadata), path)
+    return len(frame)
+
+
+@metrics.timed("snapshot.load")
+def load_snapshot(
+    columns=None,
+    since=None,
+    store_version=None,
+    with_content=False,
+    path=SNAPSHOT_PATH,
+    content_path=CONTENT_SNAPSHOT_PATH,
+):
+    """
+    Read stored articles from the memory-mapped columnar snapshot
+    Only the requested columns are read from the mapped file; dictionary-encoded
+    columns come back as pandas categoricals.
+
+    Args:
+        columns: Column names from LIST_COLUMNS (defaults to all of them)
+        since: Only articles published at or after this ISO timestamp
+        store_version: Only use the snapshot if it was written at this store
+            version
+        with_content: Also read the content column from the content file
+
+    Returns:
+        DataFrame: Flat article rows, newest first, or None if the snapshot is
+            missing or out of date
+    """
+    if not os.path.exists(path):
+        return None
+    table = _read_table(path)
+    version = _store_version(table)
+    if store_version is not None and version != store_version:
+        return None
+
+    mask = None
+    if since:
+        start = pd.Timestamp(since)
+        if start.tzinfo is None:
+            start = start.tz_localize("UTC")
+        mask = pc.greater_equal(
+            table["publishedAt"],
+            pa.scalar(start, type=table.schema.field("publishedAt").type),
+        )
+    table = table.select(columns or LIST_COLUMNS)
+
+    if with_content:
+        if not os.path.exists(content_path):
+            return None
+        content = _read_table(content_path)
+        if _store_version(content) != version or content.num_rows != table.num_rows:
+            return None
+        table = table.append_column("content", content["content"])
+
+    if mask is not None:
+        table = table.filter(mask)
+    return table.to_pandas()
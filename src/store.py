@@ -0,0 +1,877 @@
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from src.dedup import (
+    SIMILARITY_THRESHOLD,
+    MinHasher,
+    article_text,
+    band_keys,
+    similarity,
+)
+from src.metrics import metrics
+
+# Default article database, next to the saved news data
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "articles.db"
+)
+
+# Columns the dashboard can ask for, mapped to their SQL expressions
+ARTICLE_COLUMNS = {
+    "id": "a.id",
+    "url": "a.url",
+    "title": "a.title",
+    "description": "a.description",
+    "content": "a.content",
+    "author": "a.author",
+    "urlToImage": "a.url_to_image",
+    "publishedAt": "a.published_at",
+    "trigger_type": "a.trigger_type",
+    "source_name": "s.name",
+    "regions": "(SELECT GROUP_CONCAT(DISTINCT t.region) FROM article_triggers t "
+    "WHERE t.article_id = a.id AND t.region != '')",
+}
+
+# Everything except the long article body
+LIST_COLUMNS = [c for c in ARTICLE_COLUMNS if c not in ("id", "content")]
+
+# Dimensions of the daily article counts in article_rollup
+ROLLUP_COLUMNS = ["day", "trigger_type", "source", "region"]
+
+# Rollup region row counting every article once, whatever its regions
+ALL_REGIONS = "*"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    source_key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    description TEXT,
+    content TEXT,
+    author TEXT,
+    url_to_image TEXT,
+    published_at TEXT,
+    trigger_type TEXT,
+    source_id INTEGER REFERENCES sources (id),
+    fetched_at REAL NOT NULL,
+    minhash BLOB
+);
+CREATE TABLE IF NOT EXISTS article_bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    PRIMARY KEY (band, bucket, article_id)
+);
+CREATE TABLE IF NOT EXISTS article_duplicates (
+    url TEXT PRIMARY KEY,
+    article_id INTEGER NOT NULL REFERENCES articles (id)
+);
+CREATE TABLE IF NOT EXISTS article_triggers (
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    trigger_type TEXT NOT NULL,
+    region TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (article_id, trigger_type, region)
+);
+CREATE TABLE IF NOT EXISTS article_companies (
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    company TEXT NOT NULL,
+    PRIMARY KEY (article_id, company)
+);
+CREATE TABLE IF NOT EXISTS article_watchlist (
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    account TEXT NOT NULL,
+    PRIMARY KEY (article_id, account)
+);
+CREATE TABLE IF NOT EXISTS article_rollup (
+    day TEXT NOT NULL,
+    trigger_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    region TEXT NOT NULL,
+    articles INTEGER NOT NULL,
+    PRIMARY KEY (day, trigger_type, source, region)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles (published_at);
+CREATE INDEX IF NOT EXISTS idx_articles_trigger_type ON articles (trigger_type);
+CREATE INDEX IF NOT EXISTS idx_article_triggers_trigger_type
+    ON article_triggers (trigger_type, region);
+CREATE INDEX IF NOT EXISTS idx_sources_name ON sources (name);
+CREATE INDEX IF NOT EXISTS idx_article_bands_article_id
+    ON article_bands (article_id);
+CREATE INDEX IF NOT EXISTS idx_article_duplicates_article_id
+    ON article_duplicates (article_id);
+CREATE INDEX IF NOT EXISTS idx_article_companies_company
+    ON article_companies (company);
+CREATE INDEX IF NOT EXISTS idx_article_watchlist_account
+    ON article_watchlist (account);
+"""
+
+
+class ArticleStore:
+    """
+    Indexed SQLite storage for sales trigger articles
+    Articles are unique by URL and keep the first trigger they were found for;
+    every trigger/region they matched is recorded in article_triggers.
+    Near-duplicates of a stored article (syndicated copies) are not stored again;
+    their URLs are linked to the canonical article in article_duplicates.
+
+    Args:
+        path: SQLite database file
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate(conn)
+            conn.executescript(SCHEMA)
+        self.hasher = MinHasher()
+        self._index_signatures()
+        if self.get_meta("rollup_built") is None:
+            self.rebuild_rollup()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _migrate(self, conn):
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(articles)")]
+        if columns and "minhash" not in columns:
+            conn.execute("ALTER TABLE articles ADD COLUMN minhash BLOB")
+
+    def _index_signatures(self):
+        """Sign articles stored before near-duplicate detection existed"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, title, description FROM articles WHERE minhash IS NULL"
+            ).fetchall()
+            for article_id, title, description in rows:
+                signature = self.hasher.signature(
+                    article_text({"title": title, "description": description})
+                )
+                self._add_signature(conn, article_id, signature)
+
+    def _add_signature(self, conn, article_id, signature):
+        if signature is None:
+            # Mark as processed; articles without text never match anything
+            conn.execute(
+                "UPDATE articles SET minhash = x'' WHERE id = ?", (article_id,)
+            )
+            return
+        conn.execute(
+            "UPDATE articles SET minhash = ? WHERE id = ?",
+            (signature.tobytes(), article_id),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO article_bands (band, bucket, article_id) "
+            "VALUES (?, ?, ?)",
+            [
+                (band, bucket, article_id)
+                for band, bucket in enumerate(band_keys(signature))
+            ],
+        )
+
+    def rebuild_rollup(self):
+        """Recount article_rollup from the stored articles (e.g. after an upgrade)"""
+        day = "substr(a.published_at, 1, 10)"
+        with self._connect() as conn:
+            conn.execute("DELETE FROM article_rollup")
+            conn.execute(
+                "INSERT INTO article_rollup "
+                "(day, trigger_type, source, region, articles) "
+                f"SELECT {day}, COALESCE(a.trigger_type, ''), s.name, ?, COUNT(*) "
+                "FROM articles a JOIN sources s ON s.id = a.source_id "
+                "WHERE a.published_at IS NOT NULL GROUP BY 1, 2, 3",
+                (ALL_REGIONS,),
+            )
+            conn.execute(
+                "INSERT INTO article_rollup "
+                "(day, trigger_type, source, region, articles) "
+                f"SELECT {day}, COALESCE(a.trigger_type, ''), s.name, t.region, "
+                "COUNT(DISTINCT a.id) "
+                "FROM articles a JOIN sources s ON s.id = a.source_id "
+                "JOIN article_triggers t ON t.article_id = a.id "
+                "WHERE a.published_at IS NOT NULL AND t.region != '' "
+                "GROUP BY 1, 2, 3, 4"
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('rollup_built', 1) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value"
+            )
+
+    def _add_to_rollup(self, conn, article_id, regions):
+        """Count a stored article once under each of the given rollup regions"""
+        conn.executemany(
+            "INSERT INTO article_rollup (day, trigger_type, source, region, articles) "
+            "SELECT substr(a.published_at, 1, 10), COALESCE(a.trigger_type, ''), "
+            "s.name, ?, 1 FROM articles a JOIN sources s ON s.id = a.source_id "
+            "WHERE a.id = ? AND a.published_at IS NOT NULL "
+            "ON CONFLICT (day, trigger_type, source, region) "
+            "DO UPDATE SET articles = articles + 1",
+            [(region, article_id) for region in regions],
+        )
+
+    def _find_canonical(self, conn, signature, before_id=None):
+        """
+        Id of the most similar stored article above the threshold, or None
+        With before_id, only articles stored before that row id are considered.
+        """
+        candidates = set()
+        for band, bucket in enumerate(band_keys(signature)):
+            candidates.update(
+                row[0]
+                for row in conn.execute(
+                    "SELECT article_id FROM article_bands WHERE band = ? AND bucket = ?",
+                    (band, bucket),
+                )
+            )
+        if before_id is not None:
+            candidates = {c for c in candidates if c < before_id}
+        best_id, best_similarity = None, SIMILARITY_THRESHOLD
+        for article_id in candidates:
+            (blob,) = conn.execute(
+                "SELECT minhash FROM articles WHERE id = ?", (article_id,)
+            ).fetchone()
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= best_similarity:
+                best_id, best_similarity = article_id, score
+        return best_id
+
+    def version(self):
+        """Counter bumped on every write, usable as a cache key for readers"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def get_meta(self, key, default=None):
+        """Read a value from the meta table"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        """Write a value to the meta table (does not bump the version)"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def trigger_query_hashes(self):
+        """
+        Hash of the query text the stored tags of each trigger were derived
+        with, from record_trigger_queries
+        """
+        return json.loads(self.get_meta("trigger_query_hashes", "{}"))
+
+    def record_trigger_queries(self, hashes):
+        """
+        Remember which query text the stored tags of each trigger came from
+
+        Args:
+            hashes: Dict of trigger name -> hash, from src.matcher.query_hashes
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'trigger_query_hashes'"
+            ).fetchone()
+            recorded = {**json.loads(row[0] if row else "{}"), **hashes}
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('trigger_query_hashes', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (json.dumps(recorded, sort_keys=True),),
+            )
+
+    def _bump_version(self, conn):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+
+    def _source_id(self, conn, source):
+        source = source or {}
+        name = source.get("name") or "Unknown"
+        source_key = source.get("id") or name
+        conn.execute(
+            "INSERT OR IGNORE INTO sources (source_key, name) VALUES (?, ?)",
+            (source_key, name),
+        )
+        return conn.execute(
+            "SELECT id FROM sources WHERE source_key = ?", (source_key,)
+        ).fetchone()[0]
+
+    def upsert_articles(self, articles, region=None):
+        """
+        Insert new articles and refresh the text fields of known ones
+
+        Args:
+            articles: NewsAPI article dicts, optionally tagged with trigger_type and
+                region (or a list of regions)
+            region: Region tag for articles that don't carry their own
+
+        Returns:
+            int: Number of articles that were not stored before, not counting
+                near-duplicates of stored ones
+        """
+        if not articles:
+            return 0
+
+        with metrics.span("store.upsert_articles", articles=len(articles)):
+            added = 0
+            now = time.time()
+            with self._connect() as conn:
+                source_ids = {}
+                for article in articles:
+                    url = article.get("url")
+                    if not url:
+                        continue
+
+                    source = article.get("source") or {}
+                    source_key = source.get("id") or source.get("name") or "Unknown"
+                    if source_key not in source_ids:
+                        source_ids[source_key] = self._source_id(conn, source)
+
+                    existing = conn.execute(
+                        "SELECT id FROM articles WHERE url = ?", (url,)
+                    ).fetchone()
+                    fields = (
+                        article.get("title"),
+                        article.get("description"),
+                        article.get("content"),
+                        article.get("author"),
+                        article.get("urlToImage"),
+                    )
+                    linked = None
+                    if not existing:
+                        linked = conn.execute(
+                            "SELECT article_id FROM article_duplicates WHERE url = ?",
+                            (url,),
+                        ).fetchone()
+                        if not linked:
+                            signature = self.hasher.signature(article_text(article))
+                            if signature is not None:
+                                canonical_id = self._find_canonical(conn, signature)
+                                if canonical_id is not None:
+                                    conn.execute(
+                                        "INSERT INTO article_duplicates (url, article_id) "
+                                        "VALUES (?, ?)",
+                                        (url, canonical_id),
+                                    )
+                                    linked = (canonical_id,)
+
+                    if existing:
+                        article_id = existing[0]
+                        conn.execute(
+                            "UPDATE articles SET title = ?, description = ?, content = ?, "
+                            "author = ?, url_to_image = ? WHERE id = ?",
+                            (*fields, article_id),
+                        )
+                    elif linked:
+                        # Near-duplicate of a stored article: only the link is kept
+                        article_id = linked[0]
+                    else:
+                        article_id = conn.execute(
+                            "INSERT INTO articles (url, title, description, content, "
+                            "author, url_to_image, published_at, trigger_type, "
+                            "source_id, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (
+                                url,
+                                *fields,
+                                article.get("publishedAt"),
+                                article.get("trigger_type"),
+                                source_ids[source_key],
+                                now,
+                            ),
+                        ).lastrowid
+                        self._add_signature(conn, article_id, signature)
+                        self._add_to_rollup(conn, article_id, [ALL_REGIONS])
+                        added += 1
+
+                    # Copies already collapsed by the caller are linked here
+                    for duplicate_url in article.get("duplicate_urls") or []:
+                        conn.execute(
+                            "INSERT OR IGNORE INTO article_duplicates (url, article_id) "
+                            "SELECT ?, ? WHERE NOT EXISTS "
+                            "(SELECT 1 FROM articles WHERE url = ?)",
+                            (duplicate_url, article_id, duplicate_url),
+                        )
+
+                    if article.get("trigger_type"):
+                        # Multi-region fetches tag one article with several regions
+                        regions = article.get("regions") or [
+                            article.get("region") or region or ""
+                        ]
+                        known_regions = {
+                            row[0]
+                            for row in conn.execute(
+                                "SELECT DISTINCT region FROM article_triggers "
+                                "WHERE article_id = ?",
+                                (article_id,),
+                            )
+                        }
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO article_triggers "
+                            "(article_id, trigger_type, region) VALUES (?, ?, ?)",
+                            [(article_id, article["trigger_type"], r) for r in regions],
+                        )
+                        self._add_to_rollup(
+                            conn,
+                            article_id,
+                            {r for r in regions if r} - known_regions,
+                        )
+
+                self._bump_version(conn)
+        metrics.increment("store.articles_added", added)
+        return added
+
+    def query_article_chunk(self, after_id=0, limit=1000):
+        """
+        Stored articles in storage order, for batch jobs walking the whole store
+
+        Args:
+            after_id: Only articles stored after this row id
+            limit: Maximum number of articles
+
+        Returns:
+            list: Dicts with id, title, description, content and trigger_type
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            return [
+                dict(row)
+                for row in conn.execute(
+                    "SELECT id, title, description, content, trigger_type "
+                    "FROM articles WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, limit),
+                )
+            ]
+
+    def _merge_into(self, conn, article_id, canonical_id):
+        """Collapse a stored article into an earlier near-duplicate of it"""
+        (url,) = conn.execute(
+            "SELECT url FROM articles WHERE id = ?", (article_id,)
+        ).fetchone()
+        conn.execute(
+            "INSERT OR IGNORE INTO article_duplicates (url, article_id) VALUES (?, ?)",
+            (url, canonical_id),
+        )
+        conn.execute(
+            "UPDATE article_duplicates SET article_id = ? WHERE article_id = ?",
+            (canonical_id, article_id),
+        )
+        # The canonical article keeps its own triggers, under both articles' regions
+        conn.execute(
+            "INSERT OR IGNORE INTO article_triggers (article_id, trigger_type, region) "
+            "SELECT ?, c.trigger_type, d.region FROM "
+            "(SELECT DISTINCT trigger_type FROM article_triggers WHERE article_id = ?) c, "
+            "(SELECT DISTINCT region FROM article_triggers WHERE article_id = ?) d",
+            (canonical_id, canonical_id, article_id),
+        )
+        for table in ("article_companies", "article_watchlist"):
+            conn.execute(
+                f"UPDATE OR IGNORE {table} SET article_id = ? WHERE article_id = ?",
+                (canonical_id, article_id),
+            )
+        for table in (
+            "article_triggers",
+            "article_companies",
+            "article_watchlist",
+            "article_bands",
+        ):
+            conn.execute(f"DELETE FROM {table} WHERE article_id = ?", (article_id,))
+        conn.execute("DELETE FROM articles WHERE id = ?", (article_id,))
+
+    def apply_reprocessed(self, results, last_article_id, dedup=True):
+        """
+        Write the re-derived fields of a chunk of stored articles in one transaction
+        The chunk's checkpoint is written in the same transaction, so a job
+        interrupted at any point resumes after the last complete chunk, and
+        writing the same results again changes nothing.
+
+        Args:
+            results: Dicts with id, trigger_type, triggers (every matching
+                trigger) and signature (uint32 array or None), in id order
+            last_article_id: Highest article id covered by the chunk
+            dedup: Collapse articles into earlier near-duplicates of them
+
+        Returns:
+            dict: Numbers of articles retagged and merged into another
+        """
+        retagged = merged = 0
+        with self._connect() as conn:
+            for result in results:
+                article_id = result["id"]
+                row = conn.execute(
+                    "SELECT trigger_type, minhash FROM articles WHERE id = ?",
+                    (article_id,),
+                ).fetchone()
+                if row is None:
+                    continue
+                signature = result["signature"]
+                if dedup and signature is not None:
+                    canonical_id = self._find_canonical(
+                        conn, signature, before_id=article_id
+                    )
+                    if canonical_id is not None:
+                        self._merge_into(conn, article_id, canonical_id)
+                        merged += 1
+                        continue
+
+                regions = [
+                    r[0]
+                    for r in conn.execute(
+                        "SELECT DISTINCT region FROM article_triggers "
+                        "WHERE article_id = ?",
+                        (article_id,),
+                    )
+                ] or [""]
+                conn.execute(
+                    "DELETE FROM article_triggers WHERE article_id = ?", (article_id,)
+                )
+                # Untagged articles keep their regions under an empty trigger
+                conn.executemany(
+                    "INSERT INTO article_triggers (article_id, trigger_type, region) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (article_id, trigger, region)
+                        for trigger in result["triggers"] or [""]
+                        for region in regions
+                    ],
+                )
+                if row[0] != result["trigger_type"]:
+                    conn.execute(
+                        "UPDATE articles SET trigger_type = ? WHERE id = ?",
+                        (result["trigger_type"], article_id),
+                    )
+                    retagged += 1
+                stored = b"" if signature is None else signature.tobytes()
+                if row[1] != stored:
+                    conn.execute(
+                        "DELETE FROM article_bands WHERE article_id = ?", (article_id,)
+                    )
+                    self._add_signature(conn, article_id, signature)
+
+            conn.execute(
+                "INSERT INTO meta (key, value) "
+                "VALUES ('reprocess_last_article_id', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (last_article_id,),
+            )
+            self._bump_version(conn)
+        return {"retagged": retagged, "merged": merged}
+
+    def link_duplicates(self, links):
+        """
+        Link near-duplicate URLs to their stored canonical articles
+
+        Args:
+            links: Dict of duplicate URL -> canonical article URL
+        """
+        if not links:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_duplicates (url, article_id) "
+                "SELECT ?, id FROM articles WHERE url = ? AND NOT EXISTS "
+                "(SELECT 1 FROM articles WHERE url = ?)",
+                [(url, canonical, url) for url, canonical in links.items()],
+            )
+
+    def import_json(self, filepath):
+        """Load articles from a saved NewsAPI-style JSON file"""
+        with open(filepath, "r") as f:
+            news_data = json.load(f)
+        return self.upsert_articles(news_data.get("articles", []))
+
+    def _where(
+        self, since=None, trigger_types=None, sources=None, urls=None, after_id=None
+    ):
+        clauses, params = [], []
+        if after_id:
+            clauses.append("a.id > ?")
+            params.append(after_id)
+        if urls is not None:
+            clauses.append(f"a.url IN ({','.join('?' * len(urls))})")
+            params.extend(urls)
+        if since:
+            clauses.append("a.published_at >= ?")
+            params.append(since)
+        if trigger_types:
+            clauses.append(f"a.trigger_type IN ({','.join('?' * len(trigger_types))})")
+            params.extend(trigger_types)
+        if sources:
+            clauses.append(f"s.name IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query_articles(
+        self,
+        columns=None,
+        since=None,
+        trigger_types=None,
+        sources=None,
+        urls=None,
+        after_id=None,
+        limit=None,
+        offset=0,
+    ):
+        """
+        Fetch articles, newest first, with only the requested columns
+
+        Args:
+            columns: Column names from ARTICLE_COLUMNS (defaults to LIST_COLUMNS)
+            since: Only articles published at or after this ISO timestamp
+            trigger_types: Only articles with one of these trigger types
+            sources: Only articles from one of these source names
+            urls: Only articles with one of these URLs
+            after_id: Only articles stored after this row id
+            limit: Maximum number of rows
+            offset: Number of rows to skip
+
+        Returns:
+            list: Flat article dicts keyed by column name
+        """
+        columns = columns or LIST_COLUMNS
+        select = ", ".join(f"{ARTICLE_COLUMNS[c]} AS {c}" for c in columns)
+        where, params = self._where(since, trigger_types, sources, urls, after_id)
+        sql = (
+            f"SELECT {select} FROM articles a JOIN sources s ON s.id = a.source_id "
+            f"{where} ORDER BY a.published_at DESC"
+        )
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+
+        with metrics.span("store.query_articles"), self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def count(self, since=None, trigger_types=None, sources=None):
+        """Number of stored articles matching the filters"""
+        where, params = self._where(since, trigger_types, sources)
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM articles a JOIN sources s ON s.id = a.source_id "
+                f"{where}",
+                params,
+            ).fetchone()[0]
+
+    def latest_published_at(self):
+        """publishedAt of the newest stored article, or None if the store is empty"""
+        with self._connect() as conn:
+            return conn.execute("SELECT MAX(published_at) FROM articles").fetchone()[0]
+
+    def query_rollup(
+        self,
+        group_by=("day", "trigger_type"),
+        since=None,
+        until=None,
+        trigger_types=None,
+        sources=None,
+        region=None,
+    ):
+        """
+        Article counts from the daily rollup, without touching the articles
+
+        Args:
+            group_by: Columns from ROLLUP_COLUMNS to group the counts by
+            since: First day (YYYY-MM-DD) to include
+            until: Last day (YYYY-MM-DD) to include
+            trigger_types: Only these trigger types
+            sources: Only these source names
+            region: Only articles tagged with this region (defaults to all
+                articles, each counted once)
+
+        Returns:
+            list: Dicts with the group_by columns and an articles count
+        """
+        group_by = [c for c in group_by if c in ROLLUP_COLUMNS]
+        clauses, params = ["region = ?"], [region or ALL_REGIONS]
+        if since:
+            clauses.append("day >= ?")
+            params.append(since[:10])
+        if until:
+            clauses.append("day <= ?")
+            params.append(until[:10])
+        if trigger_types:
+            clauses.append(f"trigger_type IN ({','.join('?' * len(trigger_types))})")
+            params.extend(trigger_types)
+        if sources:
+            clauses.append(f"source IN ({','.join('?' * len(sources))})")
+            params.extend(sources)
+
+        select = ", ".join(group_by + ["SUM(articles) AS articles"])
+        sql = f"SELECT {select} FROM article_rollup WHERE {' AND '.join(clauses)}"
+        if group_by:
+            sql += f" GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}"
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def latest_rollup_day(self):
+        """Most recent day in the rollup, or None if it is empty"""
+        with self._connect() as conn:
+            return conn.execute("SELECT MAX(day) FROM article_rollup").fetchone()[0]
+
+    def reset_companies(self, version):
+        """Drop all company tags, to be redone by a new extractor version"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM article_companies")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                [("companies_version", version), ("companies_last_article_id", 0)],
+            )
+
+    def add_article_companies(self, companies, last_article_id):
+        """
+        Store the company tags of a batch of articles in one transaction
+
+        Args:
+            companies: Dict of article id -> list of company names
+            last_article_id: Highest article id covered by the batch
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_companies (article_id, company) "
+                "VALUES (?, ?)",
+                [
+                    (article_id, company)
+                    for article_id, names in companies.items()
+                    for company in names
+                ],
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) "
+                "VALUES ('companies_last_article_id', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = "
+                "MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+                (last_article_id,),
+            )
+
+    def query_companies(self, since=None, trigger_types=None, sources=None):
+        """
+        Company tags of the stored articles matching the filters
+
+        Returns:
+            list: Dicts with url and company, one per tag
+        """
+        where, params = self._where(since, trigger_types, sources)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            return [
+                dict(row)
+                for row in conn.execute(
+                    "SELECT a.url AS url, c.company AS company "
+                    "FROM article_companies c JOIN articles a ON a.id = c.article_id "
+                    f"JOIN sources s ON s.id = a.source_id {where}",
+                    params,
+                )
+            ]
+
+    def reset_watchlist(self, version):
+        """Drop all watchlist hits, to be redone for a changed watchlist"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM article_watchlist")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                [("watchlist_version", version), ("watchlist_last_article_id", 0)],
+            )
+
+    def add_watchlist_hits(self, hits, last_article_id):
+        """
+        Store the watchlist hits of a batch of articles in one transaction
+
+        Args:
+            hits: Dict of article id -> list of watchlist account names
+            last_article_id: Highest article id covered by the batch
+        """
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_watchlist (article_id, account) "
+                "VALUES (?, ?)",
+                [
+                    (article_id, account)
+                    for article_id, accounts in hits.items()
+                    for account in accounts
+                ],
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) "
+                "VALUES ('watchlist_last_article_id', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = "
+                "MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+                (last_article_id,),
+            )
+
+    def query_watchlist_hits(self, since=None, accounts=None, after_id=None):
+        """
+        Watchlist hits of the stored articles, newest first
+
+        Args:
+            since: Only articles published at or after this ISO timestamp
+            accounts: Only hits for these account names
+            after_id: Only articles stored after this row id
+
+        Returns:
+            list: Dicts with id, url, title, publishedAt, trigger_type,
+                source_name and account, one per hit
+        """
+        where, params = self._where(since, after_id=after_id)
+        if accounts:
+            where += " AND " if where else "WHERE "
+            where += f"w.account IN ({','.join('?' * len(accounts))})"
+            params.extend(accounts)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            return [
+                dict(row)
+                for row in conn.execute(
+                    "SELECT a.id AS id, a.url AS url, a.title AS title, "
+                    "a.published_at AS publishedAt, a.trigger_type AS trigger_type, "
+                    "s.name AS source_name, w.account AS account "
+                    "FROM article_watchlist w JOIN articles a ON a.id = w.article_id "
+                    f"JOIN sources s ON s.id = a.source_id {where} "
+                    "ORDER BY a.published_at DESC",
+                    params,
+                )
+            ]
+
+    def get_duplicate_urls(self, url):
+        """URLs of the near-identical copies linked to a stored article"""
+        with self._connect() as conn:
+            return [
+                row[0]
+                for row in conn.execute(
+                    "SELECT d.url FROM article_duplicates d "
+                    "JOIN articles a ON a.id = d.article_id WHERE a.url = ? "
+                    "ORDER BY d.url",
+                    (url,),
+                )
+            ]
+
+    def get_content(self, url):
+        """Full stored content of a single article"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content FROM articles WHERE url = ?", (url,)
+            ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,82 @@
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Seconds to wait for a connection to NewsAPI, and for its response
+CONNECT_TIMEOUT = float(os.getenv("NEWS_HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("NEWS_HTTP_READ_TIMEOUT", "20"))
+
+# Retries after connection errors only: a request that reached NewsAPI (a read
+# timeout or an error response) counts against the daily limit, but the
+# request budget is charged once per call, so those are never retried here
+MAX_RETRIES = int(os.getenv("NEWS_HTTP_RETRIES", "2"))
+
+# Exponential back-off between retries, plus up to RETRY_JITTER random seconds
+# so concurrent queries that failed together don't retry in lockstep
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_JITTER = 0.5
+
+# Keep-alive connections kept open per host
+DEFAULT_POOL_SIZE = 8
+
+
+class TimeoutSession(requests.Session):
+    """
+    requests.Session that applies its own (connect, read) timeout to every request
+    newsapi-python always passes timeout=30; this replaces it with the
+    configured timeouts.
+    """
+
+    def __init__(self, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs["timeout"] = self.timeout
+        return super().request(method, url, **kwargs)
+
+
+def build_session(
+    pool_size=DEFAULT_POOL_SIZE,
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+    max_retries=MAX_RETRIES,
+):
+    """
+    Build the HTTP session for NewsAPI calls
+    One session is shared by the sequential and the concurrent fetch paths, so
+    requests reuse pooled keep-alive connections (no new TLS handshake per
+    query), ask for gzip responses and retry failed connections with jittered
+    exponential back-off.
+
+    Args:
+        pool_size: Connections kept open per host, at least the number of
+            requests in flight at once
+        connect_timeout: Seconds to wait for a connection
+        read_timeout: Seconds to wait for the response
+        max_retries: Retries of GET requests after connection errors
+
+    Returns:
+        TimeoutSession: Session ready to pass to NewsApiClient
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        status=0,
+        other=0,
+        allowed_methods=frozenset(["GET"]),
+        backoff_factor=RETRY_BACKOFF_SECONDS,
+        backoff_jitter=RETRY_JITTER,
+        respect_retry_after_header=False,
+        # Hand error responses back so NewsAPI's error body is reported
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = TimeoutSession(timeout=(connect_timeout, read_timeout))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+    return session
@@ -0,0 +1,178 @@
+import csv
+import hashlib
+import os
+
+from src.entities import GAZETTEER_TOKEN_RE, LEGAL_SUFFIXES
+from src.matcher import MATCH_FIELDS, AhoCorasick
+from src.pipeline import drain, write_jsonl
+
+# Tracked accounts, e.g. a CRM export: account, aliases (separated by "|"), owner
+WATCHLIST_PATH = os.getenv(
+    "NEWS_WATCHLIST",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "watchlist.csv"),
+)
+
+# New watchlist hits found by the ingestion service, one JSON line per hit
+ALERTS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "watchlist_alerts.jsonl"
+)
+
+# Bumped when the matching rules change, so stored articles are re-matched
+WATCHLIST_MATCHER_VERSION = 2
+
+# Articles matched per store transaction
+BATCH_SIZE = 500
+
+
+def load_watchlist(path=WATCHLIST_PATH):
+    """
+    Read the watchlist CSV
+
+    Returns:
+        dict: Account name -> {"aliases": names it's matched by (the account
+            name first), "owner": account owner or ""}
+    """
+    accounts = {}
+    if not os.path.exists(path):
+        return accounts
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            account = (row.get("account") or "").strip()
+            if not account or account.startswith("#"):
+                continue
+            aliases = [a.strip() for a in (row.get("aliases") or "").split("|")]
+            entry = accounts.setdefault(account, {"aliases": [account], "owner": ""})
+            entry["aliases"] += [a for a in aliases if a and a not in entry["aliases"]]
+            entry["owner"] = entry["owner"] or (row.get("owner") or "").strip()
+    return accounts
+
+
+def alias_words(alias):
+    """
+    Word sequence an alias is matched by
+    Trailing legal forms are dropped, so "Wilmar International Ltd" also
+    matches articles that just say "Wilmar International". At least two words
+    are kept: "Sea Limited" stripped to "Sea" would match any article about
+    the sea.
+    """
+    words = GAZETTEER_TOKEN_RE.findall(alias)
+    while len(words) > 2 and words[-1] in LEGAL_SUFFIXES:
+        words = words[:-1]
+    return tuple(words)
+
+
+class WatchlistMatcher:
+    """
+    Watchlist accounts compiled into one multi-pattern automaton
+    Every alias of every account is a pattern of the AhoCorasick automaton, so
+    an article is matched against the whole watchlist in one pass over each of
+    its fields, however many accounts are tracked. Matching is case-sensitive
+    on whole words, like the company gazetteer.
+
+    Args:
+        path: Watchlist CSV, see config/watchlist.csv
+    """
+
+    def __init__(self, path=WATCHLIST_PATH):
+        self.accounts = load_watchlist(path)
+        self._pattern_accounts = []
+        patterns = {}
+        for account, entry in self.accounts.items():
+            for alias in entry["aliases"]:
+                words = alias_words(alias)
+                if words and words not in patterns:
+                    patterns[words] = len(patterns)
+                    self._pattern_accounts.append(account)
+        self.automaton = AhoCorasick(patterns)
+
+        digest = hashlib.sha1(repr(sorted(patterns.items())).encode("utf-8"))
+        # Stored hits are redone when either the rules or the watchlist change
+        self.version = f"{WATCHLIST_MATCHER_VERSION}:{digest.hexdigest()[:8]}"
+
+    def match(self, article):
+        """
+        Watchlist accounts mentioned in an article
+
+        Returns:
+            list: Account names, in watchlist order
+        """
+        found = set()
+        for field in MATCH_FIELDS:
+            text = article.get(field)
+            if text:
+                self.automaton.find(GAZETTEER_TOKEN_RE.findall(text), found)
+        accounts = {self._pattern_accounts[i] for i in found}
+        return [account for account in self.accounts if account in accounts]
+
+
+def update_watchlist_index(store, matcher=None, batch_size=BATCH_SIZE):
+    """
+    Match the stored articles not processed yet against the watchlist
+    Progress is tracked by article id in the store, so each article is matched
+    once; editing the watchlist re-matches everything.
+
+    Args:
+        store: ArticleStore to read and tag
+        matcher: Optional WatchlistMatcher
+        batch_size: Articles per write transaction
+
+    Returns:
+        int: Number of articles processed
+    """
+    matcher = matcher or WatchlistMatcher()
+    if store.get_meta("watchlist_version") != matcher.version:
+        store.reset_watchlist(matcher.version)
+
+    last_article_id = int(store.get_meta("watchlist_last_article_id", 0))
+    articles = sorted(
+        store.query_articles(columns=["id"] + MATCH_FIELDS, after_id=last_article_id),
+        key=lambda article: article["id"],
+    )
+    for start in range(0, len(articles), batch_size):
+        batch = articles[start : start + batch_size]
+        store.add_watchlist_hits(
+            {article["id"]: matcher.match(article) for article in batch},
+            last_article_id=batch[-1]["id"],
+        )
+    return len(articles)
+
+
+def collect_watchlist_alerts(store, matcher=None, path=ALERTS_PATH):
+    """
+    Watchlist hits on articles stored since the last call, appended to path
+    The first call only starts the cursor, so installing a watchlist doesn't
+    raise alerts for the whole stored history.
+
+    Args:
+        store: ArticleStore with an up-to-date watchlist index
+        matcher: Optional WatchlistMatcher, for the account owners
+        path: JSON Lines file the alerts are appended to
+
+    Returns:
+        list: Alert dicts (account, owner, title, url, source_name,
+            publishedAt, trigger_type), newest first
+    """
+    matcher = matcher or WatchlistMatcher()
+    alerted_id = store.get_meta("watchlist_alerted_id")
+    last_article_id = int(store.get_meta("watchlist_last_article_id", 0))
+    if alerted_id is None:
+        store.set_meta("watchlist_alerted_id", last_article_id)
+        return []
+
+    alerts = [
+        {
+            "account": hit["account"],
+            "owner": matcher.accounts.get(hit["account"], {}).get("owner", ""),
+            "title": hit["title"],
+            "url": hit["url"],
+            "source_name": hit["source_name"],
+            "publishedAt": hit["publishedAt"],
+            "trigger_type": hit["trigger_type"],
+        }
+        for hit in store.query_watchlist_hits(after_id=int(alerted_id))
+        if hit["id"] <= last_article_id
+    ]
+    if alerts:
+        drain(write_jsonl(alerts, path))
+    store.set_meta("watchlist_alerted_id", last_article_id)
+    return alerts